@@ -22,6 +22,8 @@ if __name__ == "__main__":
 class Tile:
     """Base class for all tiles in the battlefield."""
 
+    __slots__ = ("tile_id", "blocking")
+
     def __init__(self, tile_id: str = TILE_ID, blocking: bool = False):
         self.tile_id = tile_id
         self.blocking = blocking
@@ -39,6 +41,8 @@ class Tile:
 class Floor(Tile):
     """Floor tile — always non-blocking."""
 
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(FLOOR_ID, False)
 
@@ -46,12 +50,21 @@ class Floor(Tile):
 class Wall(Tile):
     """Wall tile — always blocking."""
 
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(WALL_ID, True)
 
 
 class Rock(Tile):
-    """Rock tile — can be destroyed to become non-blocking."""
+    """
+    Rock tile — can be destroyed to become non-blocking.
+
+    A live rock placed in a Battlefield tells every battlefield holding it when
+    it is destroyed or repaired, so their indices and sight lines stay current.
+    """
+
+    __slots__ = ("_destroyed", "_observers")
 
     def __init__(self, is_destroyed: bool):
         super().__init__(tile_id=ROCK_ID, blocking=not is_destroyed)
@@ -59,6 +72,7 @@ class Rock(Tile):
         if self._destroyed:
             self.tile_id = DESTROYED_ID
             self.blocking = False
+        self._observers: list = []  # (Battlefield, position) pairs holding this rock
 
     def __repr__(self) -> str:
         return f"Rock({self._destroyed})"
@@ -70,6 +84,120 @@ class Rock(Tile):
         self._destroyed = True
         self.tile_id = DESTROYED_ID
         self.blocking = False
+        for battlefield, pos in self._observers:
+            battlefield._rock_destroyed(pos)
+
+    def repair(self):
+        """Undo destroy, e.g. when restoring a WTModel snapshot."""
+        self._destroyed = False
+        self.tile_id = ROCK_ID
+        self.blocking = True
+        for battlefield, pos in self._observers:
+            battlefield._rock_repaired(pos)
+
+    def _attach(self, battlefield, pos: Position):
+        """Start reporting changes to battlefield, which holds this rock at pos."""
+        if (battlefield, pos) not in self._observers:
+            self._observers.append((battlefield, pos))
+
+
+class _DestroyedRock(Rock):
+    """The destroyed rock shared by every cell loaded as DESTROYED_ID."""
+
+    __slots__ = ()
+
+    def __init__(self):
+        super().__init__(True)
+
+    def repair(self):
+        raise ValueError("A rock loaded as destroyed cannot be repaired")
+
+
+# Tiles that can never change state are shared between every cell that uses them.
+_SHARED_TILES: dict[str, Tile] = {
+    FLOOR_ID: Floor(),
+    WALL_ID: Wall(),
+    DESTROYED_ID: _DestroyedRock(),
+}
+
+
+def make_tile(tile_id: str) -> Tile:
+    """
+    Return a tile for the given id.
+
+    Floors, walls and destroyed rocks are shared instances; live rocks get their
+    own instance because Rock.destroy mutates them.
+    Raises:
+        ValueError: if tile_id is not a known tile id.
+    """
+    tile = _SHARED_TILES.get(tile_id)
+    if tile is not None:
+        return tile
+    if tile_id == ROCK_ID:
+        return Rock(False)
+    raise ValueError(INVALID_TILE_MSG)
+
+
+# --------------------- ZOBRIST HASHING ---------------------
+_MASK64 = (1 << 64) - 1
+_ZOBRIST_KEYS: dict[tuple, int] = {}
+
+
+def zobrist_key(*feature) -> int:
+    """
+    Return the 64-bit Zobrist key for a feature made of ints and tuples of
+    ints, such as (ord(tank id), position, heading, speed).
+
+    Hashes of ints are not salted, so keys are the same in every process and
+    every run.
+    """
+    key = _ZOBRIST_KEYS.get(feature)
+    if key is None:
+        # splitmix64 finaliser over the tuple hash to spread every input bit
+        key = hash(feature) & _MASK64
+        key = ((key ^ (key >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+        key = ((key ^ (key >> 27)) * 0x94D049BB133111EB) & _MASK64
+        key ^= key >> 31
+        _ZOBRIST_KEYS[feature] = key
+    return key
+
+
+class TranspositionTable:
+    """
+    Bounded map from state hashes to values, for search deduplication.
+
+    When full, the oldest entries are dropped first.
+    """
+
+    def __init__(self, capacity: int = 1 << 20):
+        self._capacity = capacity
+        self._entries: dict[int, object] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: int) -> bool:
+        return key in self._entries
+
+    def get(self, key: int, default=None):
+        return self._entries.get(key, default)
+
+    def put(self, key: int, value=None):
+        """Store value under key, evicting the oldest entry if full."""
+        entries = self._entries
+        if key not in entries and len(entries) >= self._capacity:
+            del entries[next(iter(entries))]
+        entries[key] = value
+
+    def add(self, key: int) -> bool:
+        """Record key as seen. Returns False if it was already present."""
+        if key in self._entries:
+            return False
+        self.put(key)
+        return True
+
+    def clear(self):
+        self._entries.clear()
 
 
 # --------------------- TANK CLASSES ---------------------
@@ -82,6 +210,8 @@ class Tank:
         self._position = position
         self._heading = heading
         self._speed = speed
+        self._observers: list = []  # WTModels tracking this tank
+        self._key = 0  # state_key() as last reported to the observers
 
     def __repr__(self) -> str:
         return f"Tank({self._position}, {self._heading}, {self._speed})"
@@ -99,28 +229,61 @@ class Tank:
         return self._position
 
     def set_position(self, new_pos: Position):
+        old_pos = self._position
         self._position = new_pos
+        if self._observers:
+            for observer in self._observers:
+                observer.tank_moved(self, old_pos)
+            self._changed()
 
     def get_heading(self) -> Heading:
         return self._heading
 
     def set_heading(self, new_heading: Heading):
         self._heading = new_heading
+        self._changed()
 
     def get_speed(self) -> int:
         return self._speed
 
     def set_speed(self, new_speed: int):
         self._speed = new_speed
+        self._changed()
+
+    # ---- Hashing ----
+    def state_key(self) -> int:
+        """Return the Zobrist key of this tank's type, pose and speed."""
+        return zobrist_key(ord(self.TANK_ID), self._position, self._heading, self._speed)
+
+    def _changed(self):
+        """Report the change in state_key() to the observers, if any."""
+        if self._observers:
+            key = self.state_key()
+            for observer in self._observers:
+                observer.tank_changed(self._key, key)
+            self._key = key
+
+    def _attach(self, observer):
+        """Start reporting changes to observer."""
+        if observer not in self._observers:
+            self._observers.append(observer)
+        self._key = self.state_key()
+
+    def _detach(self, observer):
+        """Stop reporting changes to observer."""
+        if observer in self._observers:
+            self._observers.remove(observer)
 
     # ---- Rotation ----
     def turn_left(self):
         row, col = self._heading
         self._heading = (-col, row)
+        self._changed()
 
     def turn_right(self):
         row, col = self._heading
         self._heading = (col, -row)
+        self._changed()
 
     def get_symbol(self) -> str:
         """Return string like [P>], [G<], [L^] based on heading."""
@@ -157,6 +320,7 @@ class Player(Tank):
 
     def set_armour(self, new_armour: int):
         self._armour = new_armour
+        self._changed()
 
     def is_destroyed(self) -> bool:
         return self._armour <= 0
@@ -164,11 +328,17 @@ class Player(Tank):
     def take_damage(self, amount: int = 1):
         """Reduce armour by amount."""
         self._armour = max(0, self._armour - amount)
+        self._changed()
+
+    def state_key(self) -> int:
+        return zobrist_key(ord(self.TANK_ID), self._position, self._heading,
+                           self._speed, self._armour)
 
     # ---- Heading Utilities ----
     def reverse_heading(self):
         dx, dy = self._heading
         self._heading = (-dx, -dy)
+        self._changed()
 
 
 class Enemy(Tank):
@@ -236,11 +406,34 @@ class Patrol(Enemy):
 class Battlefield:
     """Represents the battlefield grid."""
 
+    _HEADINGS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+
     def __init__(self, tiles: list[list[Tile]]):
         self._tiles = tiles
         self._rows = len(tiles)
         self._cols = len(tiles[0]) if tiles else 0
 
+        # Rock indices, built once so rock queries never rescan the grid
+        self._rocks: dict[Position, Rock] = {}
+        for r, row in enumerate(tiles):
+            for c, tile in enumerate(row):
+                if isinstance(tile, Rock):
+                    self._rocks[(r, c)] = tile
+        self._live_rocks = {
+            pos: rock for pos, rock in self._rocks.items() if not rock.is_destroyed()
+        }
+        # Live rocks report destroy() and repair() back to every battlefield
+        # holding them, however they are reached
+        for pos, rock in self._live_rocks.items():
+            rock._attach(self, pos)
+        # Rocks destroyed since construction, oldest first, for snapshots,
+        # and the XOR of their Zobrist keys
+        self._destroyed: list[Position] = []
+        self._rock_hash = 0
+        # heading -> visible counts for each row (horizontal headings) or
+        # column (vertical headings), scanned on first use
+        self._sight: dict[Heading, list[memoryview | None]] | None = None
+
     def __repr__(self) -> str:
         return f"Battlefield({self._tiles})"
 
@@ -250,31 +443,467 @@ class Battlefield:
     def get_tiles(self) -> list[list[Tile]]:
         return self._tiles
 
+    def get_dims(self) -> tuple[int, int]:
+        """Return the (rows, columns) dimensions of the battlefield."""
+        return self._rows, self._cols
+
+    def tile_codes(self) -> bytes:
+        """
+        Return the tile id of every cell in row-major order, one byte each.
+
+        Raises:
+            ValueError: if the rows are not all the same length.
+        """
+        if not self._is_rectangular():
+            raise ValueError("Battlefield rows differ in length")
+        return "".join(str(tile) for row in self._tiles for tile in row).encode("ascii")
+
+    def _is_rectangular(self) -> bool:
+        return all(len(row) == self._cols for row in self._tiles)
+
     def get_tile(self, pos: Position) -> Tile:
         x, y = pos
         return self._tiles[x][y]
 
     def get_rocks(self) -> dict[Position, Rock]:
-        rocks = {}
-        for r, row in enumerate(self._tiles):
-            for c, tile in enumerate(row):
-                if isinstance(tile, Rock):
-                    rocks[(r, c)] = tile
-        return rocks
+        return dict(self._rocks)
+
+    def get_live_rocks(self) -> dict[Position, Rock]:
+        """Return the rocks that have not been destroyed, keyed by position."""
+        return dict(self._live_rocks)
+
+    def destroy_rock(self, pos: Position):
+        """Destroy the tile at pos if it can be destroyed."""
+        tile = self.get_tile(pos)
+        if hasattr(tile, "destroy"):
+            tile.destroy()
+
+    def _rock_destroyed(self, pos: Position):
+        """Called by a rock this battlefield holds after Rock.destroy."""
+        if self._live_rocks.pop(pos, None) is not None:
+            self._record_destroyed(pos)
+            self._update_sight_lines(pos)
+
+    def _rock_repaired(self, pos: Position):
+        """Called by a rock this battlefield holds after Rock.repair."""
+        if pos in self._live_rocks:
+            return
+        self._live_rocks[pos] = self.get_tile(pos)
+        self._unrecord_destroyed(pos)
+        self._update_sight_lines(pos)
+
+    def _record_destroyed(self, pos: Position):
+        self._destroyed.append(pos)
+        self._rock_hash ^= zobrist_key(ord(DESTROYED_ID), pos)
+
+    def _unrecord_destroyed(self, pos: Position):
+        if self._destroyed[-1] == pos:
+            self._destroyed.pop()  # The usual case, from restore_rocks
+        else:
+            self._destroyed.remove(pos)
+        self._rock_hash ^= zobrist_key(ord(DESTROYED_ID), pos)
+
+    def destroyed_rocks(self) -> tuple[Position, ...]:
+        """Return the positions of rocks destroyed since construction, in order."""
+        return tuple(self._destroyed)
+
+    def rock_hash(self) -> int:
+        """Return the Zobrist hash of the rocks destroyed since construction."""
+        return self._rock_hash
+
+    def restore_rocks(self, destroyed: tuple[Position, ...]):
+        """
+        Repair and destroy rocks so that destroyed_rocks() returns destroyed.
+
+        Only the rocks after the longest common prefix with the current
+        history are touched.
+        """
+        current = self._destroyed
+        common = 0
+        for mine, theirs in zip(current, destroyed):
+            if mine != theirs:
+                break
+            common += 1
+        # Each repair removes its rock from the end of current
+        for pos in reversed(current[common:]):
+            self.get_tile(pos).repair()
+        for pos in destroyed[common:]:
+            self.destroy_rock(pos)
+
+    # --- Line of sight ---
+    def visible_distance(self, pos: Position, heading: Heading) -> int:
+        """
+        Return how many cells are visible from pos looking along heading, up to
+        and including the first blocking tile or the last in-bounds cell.
+
+        Answers for the four unit headings come from per-row and per-column
+        tables. Each line is scanned on first use and again after a rock on it
+        is destroyed. Other cases fall back to stepping cell by cell.
+        """
+        if self._sight is None:
+            self._build_sight_lines()
+        lines = self._sight.get(heading)
+        if lines is None or not self.in_bounds(pos):
+            return self._march(pos, heading)
+        x, y = pos
+        line, offset = (x, y) if heading[0] == 0 else (y, x)
+        counts = lines[line]
+        if counts is None:
+            counts = lines[line] = self._scan_line(heading, line)
+        return counts[offset]
+
+    def _march(self, pos: Position, heading: Heading) -> int:
+        x, y = pos
+        dx, dy = heading
+        distance = 0
+        while True:
+            x += dx
+            y += dy
+            if not self.in_bounds((x, y)):
+                return distance
+            distance += 1
+            if self.is_blocking((x, y)):
+                return distance
+
+    def _build_sight_lines(self):
+        self._sight = {}
+        if not self._is_rectangular():
+            return  # Ragged grids always step cell by cell
+        for heading in self._HEADINGS:
+            lines = self._rows if heading[0] == 0 else self._cols
+            self._sight[heading] = [None] * lines
+        # 0, 1, 2, ...: each run of counts on a line is a slice of this
+        size = max(self._rows, self._cols)
+        self._ramp = memoryview(bytearray(4 * (size + 1))).cast("I")
+        for i in range(size + 1):
+            self._ramp[i] = i
+
+    def _blocking_line(self, heading: Heading, line: int) -> bytes:
+        """Return 1 for each blocking cell of a row, or a column for vertical headings."""
+        if heading[0] == 0:
+            cells = self._tiles[line]
+        else:
+            cells = [row[line] for row in self._tiles]
+        return bytes(tile.is_blocking() for tile in cells)
+
+    def _scan_line(self, heading: Heading, line: int) -> memoryview:
+        """
+        Return the visible count from each cell of a row or column looking
+        along heading, in one pass over the blockers on that line.
+        """
+        blocking = self._blocking_line(heading, line)
+        size = len(blocking)
+        counts = memoryview(bytearray(4 * size)).cast("I")
+        ramp = self._ramp
+        if heading[0] + heading[1] > 0:
+            # Each cell sees up to the next blocker after it, or the last cell
+            start = 0
+            blocker = blocking.find(1)
+            while blocker != -1:
+                counts[start:blocker] = ramp[blocker - start:0:-1]
+                start = blocker
+                blocker = blocking.find(1, blocker + 1)
+            counts[start:] = ramp[size - 1 - start::-1]
+        else:
+            # Each cell sees back to the previous blocker before it, or the first cell
+            end = size
+            blocker = blocking.rfind(1)
+            while blocker != -1:
+                counts[blocker + 1:end] = ramp[1:end - blocker]
+                end = blocker + 1
+                blocker = blocking.rfind(1, 0, blocker)
+            counts[:end] = ramp[:end]
+        return counts
+
+    def _update_sight_lines(self, pos: Position):
+        """Drop the row and column through pos after it changed, to be rescanned."""
+        if not self._sight:
+            return
+        x, y = pos
+        for heading, lines in self._sight.items():
+            lines[x if heading[0] == 0 else y] = None
 
     def in_bounds(self, pos: Position) -> bool:
         x, y = pos
         return 0 <= x < self._rows and 0 <= y < self._cols
 
+    def is_blocking(self, pos: Position) -> bool:
+        """Return True if the tile at pos blocks movement and line of sight."""
+        x, y = pos
+        return self._tiles[x][y].is_blocking()
+
+
+class CompactBattlefield(Battlefield):
+    """
+    Battlefield stored as a flat bytearray of tile ids plus a blocking map.
+
+    Tile objects are only materialised when callers ask for them through
+    get_tile, get_tiles or get_rocks. Floors, walls and destroyed rocks are
+    the shared make_tile instances, while each live rock gets one Rock that is
+    reused across calls and reports its destruction back into the arrays.
+    """
+
+    # load_model uses this representation for levels with at least this many cells
+    MIN_CELLS = 10_000
+
+    _TILE_IDS = frozenset((FLOOR_ID, WALL_ID, ROCK_ID, DESTROYED_ID))
+    _TILE_CODES = "".join(sorted(_TILE_IDS)).encode("ascii")
+    _SHARED = {ord(tile_id): tile for tile_id, tile in _SHARED_TILES.items()}
+    # bytes.translate tables marking blocking cells and rock cells with 1
+    _BLOCKING_TABLE = bytes(code in (ord(WALL_ID), ord(ROCK_ID)) for code in range(256))
+    _ROCK_TABLE = bytes(code in (ord(ROCK_ID), ord(DESTROYED_ID)) for code in range(256))
+
+    def __init__(self, rows: list[str]):
+        """
+        Build a battlefield from rows of tile ids.
+
+        Raises:
+            ValueError: if a row contains an unknown tile id or rows differ in length.
+        """
+        cols = len(rows[0]) if rows else 0
+        for row in rows:
+            if len(row) != cols or not self.valid_row(row):
+                raise ValueError(INVALID_TILE_MSG)
+        self._setup(bytearray("".join(rows), "ascii"), len(rows), cols)
+
+    @classmethod
+    def from_codes(cls, codes: bytes, rows: int, cols: int) -> "CompactBattlefield":
+        """
+        Build a battlefield from row-major tile ids, one byte per cell.
+
+        Raises:
+            ValueError: if codes has the wrong length or an unknown tile id.
+        """
+        if len(codes) != rows * cols or codes.translate(None, cls._TILE_CODES):
+            raise ValueError(INVALID_TILE_MSG)
+        battlefield = cls.__new__(cls)
+        battlefield._setup(bytearray(codes), rows, cols)
+        return battlefield
+
+    def _setup(self, codes: bytearray, rows: int, cols: int):
+        self._rows = rows
+        self._cols = cols
+        self._codes = codes
+        self._blocking = codes.translate(self._BLOCKING_TABLE)
+        self._rock_views: dict[int, Rock] = {}
+
+        self._rock_indices = []
+        rock_marks = codes.translate(self._ROCK_TABLE)
+        index = rock_marks.find(1)
+        while index != -1:
+            self._rock_indices.append(index)
+            index = rock_marks.find(1, index + 1)
+        # dict rather than set to keep row-major order without sorting
+        rock = ord(ROCK_ID)
+        self._live_rock_indices = dict.fromkeys(
+            index for index in self._rock_indices if codes[index] == rock
+        )
+        self._destroyed: list[Position] = []
+        self._rock_hash = 0
+        self._sight = None
+        self._tiles = None  # list[list[Tile]] built on first get_tiles()
+
+    @classmethod
+    def valid_row(cls, row: str) -> bool:
+        """Return True if every character of row is a known tile id."""
+        return cls._TILE_IDS.issuperset(row)
+
+    @classmethod
+    def suits(cls, rows: list[str]) -> bool:
+        """Return True if rows are large and rectangular enough to store compactly."""
+        if not rows:
+            return False
+        cols = len(rows[0])
+        return len(rows) * cols >= cls.MIN_CELLS and all(len(row) == cols for row in rows)
+
+    def __repr__(self) -> str:
+        return f"CompactBattlefield({str(self).splitlines()})"
+
+    def __str__(self) -> str:
+        cols = self._cols
+        codes = self._codes
+        return "\n".join(
+            codes[start:start + cols].decode("ascii")
+            for start in range(0, len(codes), cols)
+        )
+
+    def _index(self, pos: Position) -> int:
+        x, y = pos
+        if x < 0:
+            x += self._rows
+        if y < 0:
+            y += self._cols
+        if not (0 <= x < self._rows and 0 <= y < self._cols):
+            raise IndexError(f"position {pos} out of range")
+        return x * self._cols + y
+
+    def _materialise(self, index: int) -> Tile:
+        code = self._codes[index]
+        if code != ord(ROCK_ID) and index not in self._rock_views:
+            return self._SHARED[code]
+        view = self._rock_views.get(index)
+        if view is None:
+            view = Rock(False)
+            view._attach(self, divmod(index, self._cols))
+            self._rock_views[index] = view
+        return view
+
+    def _rock_destroyed(self, pos: Position):
+        x, y = pos
+        self._mark_destroyed(x * self._cols + y)
+
+    def _rock_repaired(self, pos: Position):
+        x, y = pos
+        self._mark_repaired(x * self._cols + y)
+
+    def _mark_destroyed(self, index: int):
+        self._codes[index] = ord(DESTROYED_ID)
+        self._blocking[index] = 0
+        if index in self._live_rock_indices:
+            del self._live_rock_indices[index]
+            pos = divmod(index, self._cols)
+            self._record_destroyed(pos)
+            self._update_sight_lines(pos)
+
+    def _mark_repaired(self, index: int):
+        if index in self._live_rock_indices:
+            return
+        self._codes[index] = ord(ROCK_ID)
+        self._blocking[index] = 1
+        self._live_rock_indices[index] = None
+        pos = divmod(index, self._cols)
+        self._unrecord_destroyed(pos)
+        self._update_sight_lines(pos)
+
+    def get_tiles(self) -> list[list[Tile]]:
+        if self._tiles is None:
+            cols = self._cols
+            self._tiles = [
+                [self._materialise(start + col) for col in range(cols)]
+                for start in range(0, len(self._codes), cols)
+            ]
+        return self._tiles
+
+    def tile_codes(self) -> bytes:
+        return bytes(self._codes)
+
+    def _is_rectangular(self) -> bool:
+        return True  # One flat array of rows x cols
+
+    def get_tile(self, pos: Position) -> Tile:
+        return self._materialise(self._index(pos))
+
+    def get_rocks(self) -> dict[Position, Rock]:
+        cols = self._cols
+        return {
+            divmod(index, cols): self._materialise(index)
+            for index in self._rock_indices
+        }
+
+    def get_live_rocks(self) -> dict[Position, Rock]:
+        cols = self._cols
+        return {
+            divmod(index, cols): self._materialise(index)
+            for index in self._live_rock_indices
+        }
+
+    def _blocking_line(self, heading: Heading, line: int) -> bytearray:
+        cols = self._cols
+        if heading[0] == 0:
+            return self._blocking[line * cols:(line + 1) * cols]
+        return self._blocking[line::cols]
+
+    def is_blocking(self, pos: Position) -> bool:
+        x, y = pos
+        return self._blocking[x * self._cols + y] == 1
+
 
 # --------------------- WTModel ---------------------
+class ModelSnapshot:
+    """
+    The mutable state of a WTModel at one moment: tank poses, speeds and
+    armour, which enemies remain, and which rocks have been destroyed. The
+    tile grid itself is not copied, so a snapshot can only be restored into
+    the model that took it, or once pickled, into a model of the same level.
+    """
+
+    __slots__ = ("_battlefield", "_player", "_enemies", "_destroyed")
+
+    def __init__(self, model: "WTModel"):
+        player = model.get_player()
+        self._battlefield = model.get_battlefield()
+        self._player = (player.get_position(), player.get_heading(),
+                        player.get_speed(), player.get_armour())
+        self._enemies = tuple(
+            (type(enemy), enemy.get_position(), enemy.get_heading(), enemy.get_speed())
+            for enemy in model.get_enemies()
+        )
+        self._destroyed = self._battlefield.destroyed_rocks()
+
+    def __repr__(self) -> str:
+        return f"ModelSnapshot({self._player}, {len(self._enemies)} enemies)"
+
+    def __reduce__(self):
+        # The battlefield is left behind, so an unpickled snapshot can be
+        # restored into any model freshly loaded from the same level
+        return _detached_snapshot, (self._player, self._enemies, self._destroyed)
+
+
+def _detached_snapshot(player, enemies, destroyed) -> ModelSnapshot:
+    snapshot = ModelSnapshot.__new__(ModelSnapshot)
+    snapshot._battlefield = None
+    snapshot._player = player
+    snapshot._enemies = enemies
+    snapshot._destroyed = destroyed
+    return snapshot
+
+
 class WTModel:
     """Logical game state for We Tank!"""
 
     def __init__(self, battlefield: Battlefield, player: Player, enemies: list[Enemy]):
         self._battlefield = battlefield
+        self._set_tanks(player, enemies.copy())
+
+    def _set_tanks(self, player: Player, enemies: list[Enemy]):
         self._player = player
-        self._enemies = enemies.copy()
+        self._enemies = enemies
+
+        # Live position -> tanks index, kept in player-then-enemy order so the
+        # last tank at a position wins, as in tank_positions
+        self._occupancy: dict[Position, list[Tank]] = {}
+        # XOR of the tanks' Zobrist keys, kept current through tank_changed,
+        # and how many tanks currently have each state_key()
+        self._tank_hash = 0
+        self._key_counts: dict[int, int] = {}
+        for tank in [player] + enemies:
+            self._occupancy.setdefault(tank.get_position(), []).append(tank)
+            tank._attach(self)
+            self._add_key(tank._key)
+
+    def snapshot(self) -> ModelSnapshot:
+        """Return a snapshot of the current state for restore."""
+        return ModelSnapshot(self)
+
+    def restore(self, snapshot: ModelSnapshot):
+        """
+        Return the game to the state captured by snapshot.
+
+        Tanks are replaced by new objects, so references to the old player
+        and enemies should not be kept across a restore.
+        Raises:
+            ValueError: if snapshot was taken from a different model.
+        """
+        if snapshot._battlefield not in (None, self._battlefield):
+            raise ValueError("Snapshot belongs to a different model")
+        self._battlefield.restore_rocks(snapshot._destroyed)
+        for tank in [self._player] + self._enemies:
+            tank._detach(self)
+        self._set_tanks(
+            Player(*snapshot._player),
+            [kind(position, heading, speed)
+             for kind, position, heading, speed in snapshot._enemies],
+        )
 
     def __repr__(self) -> str:
         return f"WTModel({repr(self._battlefield)}, {repr(self._player)}, {repr(self._enemies)})"
@@ -301,27 +930,73 @@ class WTModel:
         return self._player.get_armour() <= 0
 
     def tank_positions(self) -> dict[Position, Tank]:
-        positions = {self._player.get_position(): self._player}
-        for enemy in self._enemies:
-            positions[enemy.get_position()] = enemy
-        return positions
+        return {pos: tanks[-1] for pos, tanks in self._occupancy.items()}
+
+    def tank_at(self, pos: Position) -> Tank | None:
+        """Return the tank at pos (the last one if several share it), or None."""
+        tanks = self._occupancy.get(pos)
+        return tanks[-1] if tanks else None
+
+    def state_hash(self) -> int:
+        """
+        Return a 64-bit Zobrist hash of the game state, maintained incrementally.
+
+        Covers the player's pose, speed and armour, each enemy's type, pose and
+        speed (as a multiset, ignoring order), and the rocks destroyed since
+        the battlefield was built. Equal states of the same level hash equally.
+        """
+        return self._tank_hash ^ self._battlefield.rock_hash()
+
+    def tank_changed(self, old_key: int, new_key: int):
+        """Fold a change in a tank's state_key() into the state hash."""
+        self._drop_key(old_key)
+        self._add_key(new_key)
+
+    @staticmethod
+    def _nth_key(key: int, n: int) -> int:
+        # The nth tank with the same state_key() gets its own key, so
+        # identical tanks do not cancel out under XOR
+        return key if n == 0 else zobrist_key(key, n)
+
+    def _add_key(self, key: int):
+        count = self._key_counts.get(key, 0)
+        self._tank_hash ^= self._nth_key(key, count)
+        self._key_counts[key] = count + 1
+
+    def _drop_key(self, key: int):
+        count = self._key_counts[key] - 1
+        self._tank_hash ^= self._nth_key(key, count)
+        if count:
+            self._key_counts[key] = count
+        else:
+            del self._key_counts[key]
+
+    def tank_moved(self, tank: Tank, old_pos: Position):
+        """Update the occupancy index after tank moved from old_pos."""
+        new_pos = tank.get_position()
+        if new_pos == old_pos:
+            return
+        tanks = self._occupancy[old_pos]
+        tanks.remove(tank)
+        if not tanks:
+            del self._occupancy[old_pos]
+        self._occupancy.setdefault(new_pos, []).append(tank)
+
+    def _remove_enemy(self, enemy: Enemy):
+        self._enemies.remove(enemy)
+        pos = enemy.get_position()
+        tanks = self._occupancy[pos]
+        tanks.remove(enemy)
+        if not tanks:
+            del self._occupancy[pos]
+        self._drop_key(enemy._key)
+        enemy._detach(self)
 
     def visible_positions(self, tank: Tank) -> list[Position]:
-        positions = []
         x, y = tank.get_position()
         dx, dy = tank.get_heading()
-        battlefield = self._battlefield
-
-        while True:
-            x += dx
-            y += dy
-            if not battlefield.in_bounds((x, y)):
-                break
-            positions.append((x, y))
-            tile = battlefield.get_tile((x, y))
-            if tile.is_blocking():
-                break
-        return positions
+        distance = self._battlefield.visible_distance((x, y), (dx, dy))
+        return [(x + dx * step, y + dy * step) for step in range(1, distance + 1)]
 
     # --- Movement & combat ---
     def advance_tank(self, tank: Tank):
@@ -335,16 +1010,15 @@ class WTModel:
             dx, dy = -dx, -dy
             steps = -speed
 
-        occupied = self.tank_positions()
-        occupied.pop(tank.get_position(), None)
+        # A tank's own cell is never on its path, so it cannot block itself
+        occupied = self._occupancy
 
         x, y = tank.get_position()
         for _ in range(steps):
             nx, ny = x + dx, y + dy
             if not self._battlefield.in_bounds((nx, ny)):
                 break
-            tile = self._battlefield.get_tile((nx, ny))
-            if tile.is_blocking() or (nx, ny) in occupied:
+            if self._battlefield.is_blocking((nx, ny)) or (nx, ny) in occupied:
                 break
             x, y = nx, ny
 
@@ -352,13 +1026,15 @@ class WTModel:
         tank.set_speed(0)
 
     def get_attack_target(self, tank: Tank) -> Position:
-        occupied = self.tank_positions()
-        for pos in self.visible_positions(tank):
-            other = occupied.get(pos)
+        return self._attack_target(tank, self.visible_positions(tank))
+
+    def _attack_target(self, tank: Tank, visible: list[Position]) -> Position:
+        """get_attack_target for a tank whose visible positions are known."""
+        for pos in visible:
+            other = self.tank_at(pos)
             if other is not None and other is not tank:
                 return pos
-            tile = self._battlefield.get_tile(pos)
-            if tile.is_blocking():
+            if self._battlefield.is_blocking(pos):
                 return pos
         return None
 
@@ -368,7 +1044,7 @@ class WTModel:
 
         for enemy in list(self._enemies):
             visible_tiles = self.visible_positions(enemy)
-            target = self.get_attack_target(enemy)
+            target = self._attack_target(enemy, visible_tiles)
 
             if player_pos in visible_tiles and target == player_pos and not player_hit:
                 self._player.take_damage(1)
@@ -396,11 +1072,9 @@ class WTModel:
             return
         for enemy in self._enemies:
             if enemy.get_position() == target:
-                self._enemies.remove(enemy)
+                self._remove_enemy(enemy)
                 return
-        tile = self._battlefield.get_tile(target)
-        if hasattr(tile, "destroy"):
-            tile.destroy()
+        self._battlefield.destroy_rock(target)
 
     def player_move(self, move: str):
         if move == "left":
@@ -426,50 +1100,87 @@ def load_model(file: str) -> WTModel:
     """
     Load a WTModel instance from the specified file.
 
-    The file must follow the string representation format of a WTModel.
+    The file must follow the string representation format of a WTModel. It is
+    read in a single pass, line by line: tile rows are validated and built as
+    they are read, then each tank is created as its line is parsed.
     Raises:
         ValueError: if the file contains invalid tiles, player, or enemy data.
         FileNotFoundError: if the file does not exist (not caught here).
     """
-    # Read file contents (no file-not-found handling per spec)
+    # No file-not-found handling per spec
     with open(file, "r", encoding="utf-8") as fh:
-        content = fh.read().rstrip("\n")
+        battlefield = _read_battlefield(fh)
+        player, enemies = _read_tanks(fh)
+
+    # Return fully constructed model
+    return WTModel(battlefield, player, enemies)
 
-    # Split battlefield and entities
-    parts = content.split("\n\n", 1)
-    if len(parts) != 2:
+
+def _read_battlefield(fh) -> Battlefield:
+    """
+    Read tile rows up to the blank line that separates them from the tanks.
+
+    Rows are built into tiles as they arrive until the level reaches
+    CompactBattlefield.MIN_CELLS, after which only the row strings are kept.
+    """
+    rows: list[str] = []
+    tiles: list[list[Tile]] | None = []
+    cells = 0
+    for number, line in enumerate(fh, 1):
+        row = line.rstrip("\n")
+        if not row and number > 1:
+            break
+        rows.append(row)
+        cells += len(row)
+        if tiles is not None and cells >= CompactBattlefield.MIN_CELLS:
+            tiles = None  # Large level: keep only the row strings
+        if tiles is not None:
+            tiles.append([make_tile(ch) for ch in row])
+        elif not CompactBattlefield.valid_row(row):
+            raise ValueError(INVALID_TILE_MSG)
+    else:
+        # No blank line, so no tanks
         raise ValueError(INVALID_TILE_MSG)
 
-    battlefield_block, entities_block = parts
-    battlefield_rows = [line.rstrip("\n") for line in battlefield_block.splitlines()]
-
-    # --- Build battlefield ---
-    tiles: list[list[Tile]] = []
-    for row in battlefield_rows:
-        row_tiles: list[Tile] = []
-        for ch in row:
-            if ch == "W":
-                row_tiles.append(Wall())
-            elif ch == " ":
-                row_tiles.append(Floor())
-            elif ch == "R":
-                row_tiles.append(Rock(False))
-            elif ch == "X":
-                row_tiles.append(Rock(True))
-            else:
-                raise ValueError(INVALID_TILE_MSG)
-        tiles.append(row_tiles)
+    if rows == [""]:
+        # A leading empty line directly before the blank line is not a row
+        rows, tiles = [], []
+
+    if tiles is not None:
+        return Battlefield(tiles)
+    if CompactBattlefield.suits(rows):
+        # Large levels skip per-cell Tile objects entirely
+        return CompactBattlefield(rows)
+    return Battlefield([[make_tile(ch) for ch in row] for row in rows])
 
-    battlefield = Battlefield(tiles)
 
-    # --- Parse entities ---
-    entity_lines = [ln.strip() for ln in entities_block.splitlines() if ln.strip()]
-    if not entity_lines:
+def _read_tanks(fh) -> tuple[Player, list[Enemy]]:
+    """Read the player line and enemy lines following the blank line."""
+    player = None
+    enemies: list[Enemy] = []
+    has_content = False
+    for line in fh:
+        if line.rstrip("\n"):
+            has_content = True
+        for entry in line.splitlines():
+            entry = entry.strip()
+            if not entry:
+                continue
+            if player is None:
+                player = _parse_player(entry)
+            else:
+                enemies.append(_parse_enemy(entry))
+
+    if not has_content:
+        # Only trailing newlines after the tiles, so there is no separator
+        raise ValueError(INVALID_TILE_MSG)
+    if player is None:
         raise ValueError(INVALID_PLAYER_MSG)
+    return player, enemies
+
 
-    # Player line
-    player_line = entity_lines[0]
-    parts = [p.strip() for p in player_line.split(",")]
+def _parse_player(line: str) -> Player:
+    parts = [p.strip() for p in line.split(",")]
     if len(parts) < 7 or parts[0] != Player.TANK_ID:
         raise ValueError(INVALID_PLAYER_MSG)
 
@@ -478,43 +1189,266 @@ def load_model(file: str) -> WTModel:
         phr, phc = int(parts[3]), int(parts[4])
         pspeed = int(parts[5])
         parmour = int(parts[6])
-        player = Player((prow, pcol), (phr, phc), pspeed, parmour)
+        return Player((prow, pcol), (phr, phc), pspeed, parmour)
     except Exception:
         raise ValueError(INVALID_PLAYER_MSG)
 
-    # Enemy lines
+
+def _parse_enemy(line: str) -> Enemy:
+    parts = [p.strip() for p in line.split(",")]
+    if len(parts) < 6:
+        raise ValueError(INVALID_ENEMY_MSG)
+    eid = parts[0]
+    try:
+        erow, ecol = int(parts[1]), int(parts[2])
+        ehr, ehc = int(parts[3]), int(parts[4])
+        espeed = int(parts[5])
+    except Exception:
+        raise ValueError(INVALID_ENEMY_MSG)
+
+    if eid == Guard.TANK_ID:
+        return Guard((erow, ecol), (ehr, ehc), espeed)
+    elif eid == Patrol.TANK_ID:
+        return Patrol((erow, ecol), (ehr, ehc), espeed)
+    else:
+        raise ValueError(INVALID_ENEMY_MSG)
+
+
+# Binary saves: a header, the tile ids as one byte per cell, then one fixed
+# width record per tank (player first). All integers are little-endian.
+#   header: magic (4) | version u16 | reserved u16 | rows u32 | cols u32 | tanks u32
+#   tank:   id (1) | padding (3) | row, col, heading row, heading col, speed,
+#           armour as i32 (armour is 0 for enemies)
+BINARY_SAVE_EXTENSION = ".wtb"
+BINARY_MAGIC = b"WTNK"
+BINARY_VERSION = 1
+_HEADER_SIZE = 20
+_TANK_FIELDS = 6
+_TANK_RECORD_SIZE = 4 + 4 * _TANK_FIELDS
+RAGGED_SAVE_MSG = "Only rectangular battlefields can be saved in the binary format!"
+
+
+def is_binary_save(file: str) -> bool:
+    """Return True if file should use the binary save format."""
+    return file.lower().endswith(BINARY_SAVE_EXTENSION)
+
+
+def save_binary_model(model: WTModel, file: str):
+    """
+    Save model to file in the binary save format.
+
+    Raises:
+        ValueError: if the battlefield is not rectangular.
+    """
+    battlefield = model.get_battlefield()
+    rows, cols = battlefield.get_dims()
+    try:
+        codes = battlefield.tile_codes()
+    except ValueError:
+        raise ValueError(RAGGED_SAVE_MSG) from None
+    tanks = [model.get_player()] + model.get_enemies()
+
+    data = bytearray(BINARY_MAGIC)
+    data += BINARY_VERSION.to_bytes(2, "little") + bytes(2)
+    for value in (rows, cols, len(tanks)):
+        data += value.to_bytes(4, "little")
+    data += codes
+    for tank in tanks:
+        (row, col), (h_row, h_col) = tank.get_position(), tank.get_heading()
+        armour = tank.get_armour() if isinstance(tank, Player) else 0
+        data += tank.get_id().encode("ascii") + bytes(3)
+        for value in (row, col, h_row, h_col, tank.get_speed(), armour):
+            data += value.to_bytes(4, "little", signed=True)
+
+    with open(file, "wb") as fh:
+        fh.write(data)
+
+
+def load_binary_model(file: str) -> WTModel:
+    """
+    Load a WTModel from a file in the binary save format.
+
+    The tile grid is handed to CompactBattlefield as raw bytes, and tank
+    records are read as fixed-width fields, so nothing is parsed per character.
+    Raises:
+        ValueError: if the header or tiles, player, or enemy records are invalid.
+        FileNotFoundError: if the file does not exist (not caught here).
+    """
+    with open(file, "rb") as fh:
+        data = memoryview(fh.read())
+
+    if len(data) < _HEADER_SIZE or data[:4] != BINARY_MAGIC or \
+            int.from_bytes(data[4:6], "little") != BINARY_VERSION:
+        raise ValueError(INVALID_TILE_MSG)
+    rows = int.from_bytes(data[8:12], "little")
+    cols = int.from_bytes(data[12:16], "little")
+    count = int.from_bytes(data[16:20], "little")
+
+    grid_end = _HEADER_SIZE + rows * cols
+    if len(data) < grid_end:
+        raise ValueError(INVALID_TILE_MSG)
+    battlefield = CompactBattlefield.from_codes(bytes(data[_HEADER_SIZE:grid_end]), rows, cols)
+
+    player = None
     enemies: list[Enemy] = []
-    for line in entity_lines[1:]:
-        parts = [p.strip() for p in line.split(",")]
-        if len(parts) < 6:
-            raise ValueError(INVALID_ENEMY_MSG)
-        eid = parts[0]
-        try:
-            erow, ecol = int(parts[1]), int(parts[2])
-            ehr, ehc = int(parts[3]), int(parts[4])
-            espeed = int(parts[5])
-        except Exception:
-            raise ValueError(INVALID_ENEMY_MSG)
-
-        if eid == Guard.TANK_ID:
-            enemies.append(Guard((erow, ecol), (ehr, ehc), espeed))
-        elif eid == Patrol.TANK_ID:
-            enemies.append(Patrol((erow, ecol), (ehr, ehc), espeed))
+    for index in range(count):
+        start = grid_end + index * _TANK_RECORD_SIZE
+        record = data[start:start + _TANK_RECORD_SIZE]
+        error = INVALID_PLAYER_MSG if index == 0 else INVALID_ENEMY_MSG
+        if len(record) != _TANK_RECORD_SIZE:
+            raise ValueError(error)
+        row, col, h_row, h_col, speed, armour = (
+            int.from_bytes(record[offset:offset + 4], "little", signed=True)
+            for offset in range(4, _TANK_RECORD_SIZE, 4)
+        )
+        tank_id = chr(record[0])
+        if index == 0:
+            if tank_id != Player.TANK_ID:
+                raise ValueError(error)
+            player = Player((row, col), (h_row, h_col), speed, armour)
+        elif tank_id == Guard.TANK_ID:
+            enemies.append(Guard((row, col), (h_row, h_col), speed))
+        elif tank_id == Patrol.TANK_ID:
+            enemies.append(Patrol((row, col), (h_row, h_col), speed))
         else:
-            raise ValueError(INVALID_ENEMY_MSG)
+            raise ValueError(error)
+    if player is None:
+        raise ValueError(INVALID_PLAYER_MSG)
 
-    # Return fully constructed model
     return WTModel(battlefield, player, enemies)
 
 
+def load_file(file: str) -> WTModel:
+    """Load a WTModel from a text or binary save, chosen by file extension."""
+    if is_binary_save(file):
+        return load_binary_model(file)
+    return load_model(file)
+
+
+def save_file(model: WTModel, file: str):
+    """
+    Save a WTModel as a text or binary save, chosen by file extension.
+
+    Raises:
+        ValueError: if a binary save is asked for a non-rectangular battlefield.
+    """
+    if is_binary_save(file):
+        save_binary_model(model, file)
+    else:
+        with open(file, "w", encoding="utf-8") as fh:
+            fh.write(str(model))
+
+
 
 # --------------------- CONTROLLER ---------------------
+UNDO = "undo"
+REWIND = "rewind"
+NOTHING_TO_UNDO_MSG = "Nothing to undo!"
+# Most turns that undo and rewind can go back
+MAX_HISTORY = 1000
+
+# Turn-taking commands that move the player, and the player_move action of each
+PLAYER_MOVES = {
+    MOVE + " " + FORWARD: "forward",
+    MOVE + " " + BACK: "back",
+    TURN + " " + LEFT: "left",
+    TURN + " " + RIGHT: "right",
+}
+
+VALID_COMMANDS = (
+    MOVE + " " + FORWARD,
+    MOVE + " " + BACK,
+    TURN + " " + LEFT,
+    TURN + " " + RIGHT,
+    FIRE,
+    WAIT,
+    HELP,
+    QUIT,
+    UNDO,
+)
+_VALID_COMMAND_SET = frozenset(VALID_COMMANDS)
+
+
+def _has_argument(argument: str) -> bool:
+    return argument != ""
+
+
+def _is_turn_count(argument: str) -> bool:
+    return argument.isdigit() and int(argument) > 0
+
+
+# Commands followed by an argument, e.g. "save FILE", and the check the argument must pass
+PREFIX_COMMANDS = {
+    SAVE: _has_argument,
+    LOAD: _has_argument,
+    REWIND: _is_turn_count,
+}
+
+
+def _split_prefix(command: str) -> tuple[str, str | None]:
+    """Split "word argument" into its parts; the argument is None without a space."""
+    word, space, argument = command.partition(" ")
+    return word, argument.lstrip() if space else None
+
+
+def _normalise(command: str, commands, prefix_checks: dict) -> str | None:
+    lower_cmd = command.lower()
+    if lower_cmd in commands:
+        return lower_cmd
+    word, argument = _split_prefix(lower_cmd)
+    check = prefix_checks.get(word)
+    if check is not None and argument is not None and check(argument):
+        return lower_cmd
+    return None
+
+
+def parse_command(command: str) -> str | None:
+    """
+    Normalise a command as typed at the prompt, using the standard commands.
+
+    Returns:
+        str | None: the lower-cased command, or None if it is not valid.
+    """
+    return _normalise(command, _VALID_COMMAND_SET, PREFIX_COMMANDS)
+
+
 class WTController:
     """Controller for We Tank! game loop."""
 
-    def __init__(self, initial_state: WTModel):
+    def __init__(self, initial_state: WTModel, view_factory=WTView, loader=load_file,
+                 sink=None):
+        """
+        Create a controller for the given game state.
+
+        Args:
+            initial_state (WTModel): Game state to play.
+            view_factory: Callable returning the view used to draw the game, 
+                    e.g. WTView or display.FramebufferView. Defaults to WTView.
+                    It is only called when the controller first draws or 
+                    prints, so a controller that never does builds no view.
+            loader: Callable taking a file name and returning a WTModel, used
+                    by the load command, e.g. levelcache.LevelCache().load.
+                    Defaults to load_file.
+            sink: display.OutputSink that the controller and view write into,
+                    e.g. display.MemorySink() to capture a game. Defaults to 
+                    the view's own sink, which buffers stdout.
+        """
         self._model = initial_state
-        self._view = WTView()
+        self._view_factory = view_factory
+        self._view = None  # Created by _get_view on first use
+        # Output is buffered here and written once per turn, before input is
+        # read, rather than by the view after each frame
+        self._sink = sink
+        self._loader = loader
+        self._show_frames = True  # False while play_script skips intermediate frames
+        # Snapshots taken before each turn, most recent last
+        self._history: list[ModelSnapshot] = []
+        self._turns = 0  # Turns taken, less those undone
+        # Command -> handler(), and prefix word -> handler(argument)
+        self._commands = {}
+        self._prefix_commands = {}
+        self._prefix_checks = {}
+        self._register_defaults()
 
     def __repr__(self) -> str:
         return f"WTController({repr(self._model)})"
@@ -522,13 +1456,44 @@ class WTController:
     def __str__(self) -> str:
         return str(self._model)
 
+    def _get_view(self):
+        """Return the view, creating it and settling the sink on first use."""
+        if self._view is None:
+            self._view = self._view_factory()
+            if self._sink is None:
+                self._sink = self._view.get_sink()
+            # The controller flushes once per turn, not the view per frame
+            self._view.set_sink(self._sink)
+        return self._view
+
+    def _print(self, text):
+        self.get_sink().write(f"{text}\n")
+
+    def get_sink(self):
+        """Return the display.OutputSink this controller writes into."""
+        if self._sink is None:
+            self._get_view()
+        return self._sink
+
+    def get_model(self) -> WTModel:
+        """Return the game state being played."""
+        return self._model
+
+    def get_turns(self) -> int:
+        """Return the number of turns taken, less any undone."""
+        return self._turns
+
     def print_game(self):
-        self._view.draw_game(
+        self._get_view().draw_game(
             self._model.get_battlefield().get_tiles(),
             self._model.get_player(),
             self._model.get_enemies(),
         )
 
+    def _show_frame(self):
+        if self._show_frames:
+            self.print_game()
+
     def load_game(self, file: str):
         """
         Replace the current game state with the state contained in the given file.
@@ -536,9 +1501,10 @@ class WTController:
             ValueError: if the file cannot be found or the contents are invalid.
         """
         try:
-            # Try to load using load_model
-            self._model = load_model(file)
-            print(LOAD_MSG)
+            # Try to load using the configured loader
+            self._model = self._loader(file)
+            self._history.clear()
+            self._print(LOAD_MSG)
 
         except FileNotFoundError:
             # Convert file-not-found to a ValueError with correct message
@@ -550,89 +1516,235 @@ class WTController:
     
     def save_game(self, file: str) -> None:
         """
-        Save the current WTModel state to a file.
+        Save the current WTModel state to a file. Files ending in
+        BINARY_SAVE_EXTENSION use the binary save format, others the text format.
 
         Args:
             file (str): The file path to save the model into.
+        Raises:
+            ValueError: if the battlefield cannot be saved in the binary format.
         """
-        with open(file, "w", encoding="utf-8") as fh:
-            fh.write(str(self._model))
-        print(SAVE_MSG)
+        save_file(self._model, file)
+        self._print(SAVE_MSG)
+
+    def rewind(self, turns: int) -> bool:
+        """
+        Undo up to the given number of turns, as far back as history allows.
+
+        Returns:
+            bool: False if there was nothing to undo.
+        """
+        if not self._history:
+            return False
+        turns = min(turns, len(self._history))
+        snapshot = self._history[-turns]
+        del self._history[-turns:]
+        self._model.restore(snapshot)
+        self._turns -= turns
+        return True
+
+    def register_command(self, command: str, handler):
+        """
+        Make a command call handler(). Replaces any existing handler.
+
+        Args:
+            command (str): The command in lower case, e.g. "stats".
+            handler: Callable taking no arguments and returning False to end
+                    play, True to carry on.
+        """
+        self._commands[command] = handler
+
+    def register_prefix_command(self, word: str, handler, check=_has_argument):
+        """
+        Make commands of the form "word argument" call handler(argument).
+
+        Args:
+            word (str): The first word of the command in lower case, e.g. "replay".
+            handler: Callable taking the argument and returning False to end
+                    play, True to carry on.
+            check: Callable returning whether an argument is valid. Defaults
+                    to accepting any non-empty argument.
+        """
+        self._prefix_commands[word] = handler
+        self._prefix_checks[word] = check
+
+    def _register_defaults(self):
+        for command, action in PLAYER_MOVES.items():
+            self.register_command(command, lambda action=action: self._take_turn(action))
+        self.register_command(FIRE, lambda: self._take_turn(FIRE))
+        self.register_command(WAIT, lambda: self._take_turn(WAIT))
+        self.register_command(HELP, self._help)
+        self.register_command(QUIT, lambda: False)
+        self.register_command(UNDO, lambda: self._undo(1))
+        self.register_prefix_command(SAVE, self._save)
+        self.register_prefix_command(LOAD, self._load)
+        self.register_prefix_command(REWIND, lambda turns: self._undo(int(turns)),
+                                     PREFIX_COMMANDS[REWIND])
+
+    def parse_command(self, command: str) -> str | None:
+        """
+        Normalise a command as typed at the prompt, using the commands
+        registered on this controller.
+
+        Returns:
+            str | None: the lower-cased command, or None if it is not valid.
+        """
+        return _normalise(command, self._commands, self._prefix_checks)
 
     def get_command(self) -> str:
-        valid_commands = [
-            MOVE + " " + FORWARD,
-            MOVE + " " + BACK,
-            TURN + " " + LEFT,
-            TURN + " " + RIGHT,
-            FIRE,
-            WAIT,
-            HELP,
-            QUIT,
-        ]
         while True:
-            command = input(COMMAND_PROMPT)
-            lower_cmd = command.lower()
-            if lower_cmd.startswith(SAVE + " ") or lower_cmd.startswith(LOAD + " "):
-                return lower_cmd
-            if lower_cmd in valid_commands:
-                return lower_cmd
-            print(INVALID_COMMAND_MSG)
+            sink = self.get_sink()
+            sink.write(COMMAND_PROMPT)
+            sink.flush()
+            command = self.parse_command(input())
+            if command is not None:
+                return command
+            self._print(INVALID_COMMAND_MSG)
+
+    def start(self):
+        """Show the opening frame and welcome message."""
+        self._show_frame()
+        self._print(WELCOME_MSG)
+
+    def handle_command(self, cmd: str) -> bool:
+        """
+        Carry out one command as returned by parse_command.
 
-    def play(self):
-        self.print_game()
-        print(WELCOME_MSG)
-        while not self._model.is_game_over():
-            cmd = self.get_command()
-            if cmd == QUIT:
-                return
-            elif cmd == HELP:
-                print(HELP_MSG)
-                continue
-            elif cmd == MOVE + " " + FORWARD:
-                self._model.player_move("forward")
-            elif cmd == MOVE + " " + BACK:
-                self._model.player_move("back")
-            elif cmd == TURN + " " + LEFT:
-                self._model.player_move("left")
-            elif cmd == TURN + " " + RIGHT:
-                self._model.player_move("right")
-            elif cmd == FIRE:
-                self._model.player_fire()
-            elif cmd == WAIT:
-                pass
-            elif cmd.startswith(SAVE + " "):
-                filename = cmd.split(maxsplit=1)[1]
-                self.save_game(filename)
-                continue
-            elif cmd.startswith(LOAD + " "):
-                filename = cmd.split(maxsplit=1)[1]
-                try:
-                    self.load_game(filename)
-                    self.print_game()
-                except ValueError as e:
-                    # Catch and print the error message (e.g., "Cannot locate the desired file!")
-                    print(e)
-                continue
+        Returns:
+            bool: False if the player quit, True otherwise.
+        Raises:
+            ValueError: if no handler is registered for the command.
+        """
+        handler = self._commands.get(cmd)
+        if handler is not None:
+            return handler()
+        word, argument = _split_prefix(cmd)
+        handler = self._prefix_commands.get(word)
+        if handler is None or argument is None:
+            raise ValueError(INVALID_COMMAND_MSG)
+        return handler(argument)
+
+    def _help(self) -> bool:
+        self._print(HELP_MSG)
+        return True
+
+    def _undo(self, turns: int) -> bool:
+        if self.rewind(turns):
+            self._show_frame()
+        else:
+            self._print(NOTHING_TO_UNDO_MSG)
+        return True
 
-            # Enemy actions after player's turn
-            if not self._model.is_game_over():
-                self._model.enemy_actions()
-                self.print_game()
+    def _save(self, filename: str) -> bool:
+        try:
+            self.save_game(filename)
+        except ValueError as e:
+            self._print(e)
+        return True
 
-        # Game over messages
+    def _load(self, filename: str) -> bool:
+        try:
+            self.load_game(filename)
+            self._show_frame()
+        except ValueError as e:
+            # Catch and print the error message (e.g., "Cannot locate the desired file!")
+            self._print(e)
+        return True
+
+    def _take_turn(self, action: str) -> bool:
+        """Play a move action, FIRE or WAIT, then the enemies' turn."""
+        # Every turn can be reversed by undo
+        self._history.append(self._model.snapshot())
+        if len(self._history) > MAX_HISTORY:
+            del self._history[0]
+        self._turns += 1
+        if action == FIRE:
+            self._model.player_fire()
+        elif action != WAIT:
+            self._model.player_move(action)
+
+        # Enemy actions after player's turn
+        if not self._model.is_game_over():
+            self._model.enemy_actions()
+            self._show_frame()
+        return True
+
+    def finish(self):
+        """Show the game over frame and message."""
         if self._model.has_won():
-            self.print_game()
-            print(WIN_MSG)
+            self._show_frame()
+            self._print(WIN_MSG)
         else:
-            print(LOSE_MSG)
+            self._print(LOSE_MSG)
+
+    def is_game_over(self) -> bool:
+        return self._model.is_game_over()
+
+    def play(self):
+        try:
+            self.start()
+            while not self._model.is_game_over():
+                if not self.handle_command(self.get_command()):
+                    return
+            self.finish()
+        finally:
+            self.get_sink().flush()
+
+    def play_script(self, commands, show_frames: bool = True):
+        """
+        Play a sequence of commands instead of prompting for them.
+
+        Each command goes through parse_command as if typed, and invalid ones
+        print INVALID_COMMAND_MSG, but no prompts are written and all output
+        is flushed once at the end. Play stops at quit, game over or the end
+        of the commands.
+
+        Args:
+            commands: Iterable of command strings, e.g. a list, a generator or
+                    an open file; trailing newlines are ignored.
+            show_frames (bool): If False, skip every frame but the one showing
+                    the final state.
+        """
+        self._show_frames = show_frames
+        try:
+            self.start()
+            for line in commands:
+                if self._model.is_game_over():
+                    break
+                cmd = self.parse_command(line.rstrip("\r\n"))
+                if cmd is None:
+                    self._print(INVALID_COMMAND_MSG)
+                elif not self.handle_command(cmd):
+                    break
+
+            self._show_frames = True
+            if self._model.is_game_over():
+                if not show_frames and not self._model.has_won():
+                    self.print_game()  # finish only draws wins
+                self.finish()
+            elif not show_frames:
+                self.print_game()
+        finally:
+            self._show_frames = True
+            self.get_sink().flush()
 
 
 # --------------------- HELPER FUNCTION ---------------------
-def play_game(file: str):
+def play_game(file: str, view_factory=WTView, script=None, show_frames: bool = True):
     """
     Load a WTModel from file, create a controller, and play the game.
+
+    Args:
+        file (str): Level file to load.
+        view_factory: Callable returning the view used to draw the game. 
+                Defaults to WTView.
+        script: Optional iterable of commands to play instead of prompting,
+                see WTController.play_script.
+        show_frames (bool): With a script, False draws only the final state.
     """
     model = load_model(file)
-    controller = WTController(model)
-    controller.play()
+    controller = WTController(model, view_factory)
+    if script is None:
+        controller.play()
+    else:
+        controller.play_script(script, show_frames)
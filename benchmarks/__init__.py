@@ -0,0 +1 @@
+"""Benchmarks for We Tank! Run from the repository root, e.g. python -m benchmarks.replay"""
@@ -0,0 +1,261 @@
+"""
+Replay the recorded sessions in gameplay/ through WTController.
+
+For each transcript the starting level is found by matching the first frame
+against the initial frame of every level in levels/, and the commands are
+taken from the lines that follow COMMAND_PROMPT. The session is then played
+with stdin and stdout redirected, timing every turn split into model time
+(enemy_actions, player_move, player_fire) and render time (draw_game), and the
+captured output is compared byte-for-byte with the transcript.
+
+Some recordings are known not to replay exactly; they are listed in
+KNOWN_DIVERGENCES with the first difference they are expected to show, and
+only a mismatch that is not listed there makes the run fail.
+
+Usage:
+    python -m benchmarks.replay [TRANSCRIPT ...] [--repeat N]
+"""
+import argparse
+import contextlib
+import glob
+import io
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import a2  # noqa: E402
+from display import WTView  # noqa: E402
+from support import COMMAND_PROMPT  # noqa: E402
+
+MODEL_METHODS = ("enemy_actions", "player_move", "player_fire")
+
+# These sessions typed commands with a trailing space (e.g. 'turn left '),
+# which the recording accepted but the controller now rejects.
+_DASHES = "-" * 80
+_REJECTED = "Invalid Command! Type `help` for a list of commands"
+KNOWN_DIVERGENCES = {
+    "load_and_save.txt": f"line 177: expected {_DASHES!r}, got {_REJECTED!r}",
+    "lose_level1.txt": f"line 126: expected {_DASHES!r}, got {_REJECTED!r}",
+    "win_level1.txt": f"line 26: expected {_DASHES!r}, got {_REJECTED!r}",
+}
+
+
+def transcript_commands(transcript: str) -> list[str]:
+    """Return the commands typed in a transcript, in order."""
+    return [
+        line.split(COMMAND_PROMPT, 1)[1]
+        for line in transcript.split("\n")
+        if COMMAND_PROMPT in line
+    ]
+
+
+def render_initial_frame(level: str) -> str:
+    """Return the frame WTController prints before the first prompt."""
+    out = io.StringIO()
+    model = a2.load_model(level)
+    with contextlib.redirect_stdout(out):
+        WTView().draw_game(model.get_battlefield().get_tiles(),
+                           model.get_player(), model.get_enemies())
+    return out.getvalue()
+
+
+def find_start_level(transcript: str, levels_dir: str) -> str | None:
+    """Return the level whose initial frame opens the transcript, if any."""
+    for level in sorted(glob.glob(os.path.join(levels_dir, "*.txt"))):
+        try:
+            frame = render_initial_frame(level)
+        except Exception:
+            continue  # invalid or unrenderable level
+        if transcript.startswith(frame):
+            return level
+    return None
+
+
+class _EchoingInput(io.StringIO):
+    """stdin replacement that echoes each line read, as a terminal would."""
+
+    def __init__(self, commands: list[str], out: io.StringIO, on_read):
+        super().__init__("".join(command + "\n" for command in commands))
+        self._out = out
+        self._on_read = on_read
+
+    def readline(self, *args) -> str:
+        self._on_read()
+        line = super().readline(*args)
+        self._out.write(line)
+        return line
+
+
+class TurnTimer:
+    """Accumulates model and render time per turn while patched in."""
+
+    def __init__(self):
+        self.turns: list[tuple[float, float]] = []
+        self._model = 0.0
+        self._render = 0.0
+
+    def end_turn(self):
+        self.turns.append((self._model, self._render))
+        self._model = 0.0
+        self._render = 0.0
+
+    def _timed(self, func, is_render: bool):
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                if is_render:
+                    self._render += elapsed
+                else:
+                    self._model += elapsed
+        return wrapper
+
+    @contextlib.contextmanager
+    def patched(self, view_class=WTView):
+        """Time WTModel's hot methods and view_class.draw_game while active."""
+        originals = [(a2.WTModel, name, getattr(a2.WTModel, name)) for name in MODEL_METHODS]
+        originals.append((view_class, "draw_game", view_class.draw_game))
+        try:
+            for owner, name, func in originals:
+                setattr(owner, name, self._timed(func, name == "draw_game"))
+            yield self
+        finally:
+            for owner, name, func in originals:
+                setattr(owner, name, func)
+
+
+def replay(level: str, commands: list[str]) -> tuple[str, TurnTimer]:
+    """
+    Play commands on level through WTController with redirected stdio.
+
+    Runs in a scratch directory holding a copy of levels/, so save commands
+    do not touch the repository.
+
+    Returns:
+        (output, timer): everything written to stdout, and per-turn timings.
+    """
+    out = io.StringIO()
+    timer = TurnTimer()
+    first_read = True
+
+    def on_read():
+        nonlocal first_read
+        if not first_read:
+            timer.end_turn()
+        first_read = False
+
+    level = os.path.abspath(level)
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as scratch:
+        shutil.copytree(os.path.join(ROOT, "levels"), os.path.join(scratch, "levels"))
+        os.chdir(scratch)
+        old_stdin = sys.stdin
+        sys.stdin = _EchoingInput(commands, out, on_read)
+        try:
+            with timer.patched(), contextlib.redirect_stdout(out):
+                controller = a2.WTController(a2.load_model(level))
+                try:
+                    controller.play()
+                except EOFError:
+                    pass  # transcript ended before the game did
+        finally:
+            sys.stdin = old_stdin
+            os.chdir(cwd)
+    timer.end_turn()
+    return out.getvalue(), timer
+
+
+def first_difference(expected: str, actual: str) -> str | None:
+    """Describe the first differing line, or None if the texts are identical."""
+    if expected == actual:
+        return None
+    expected_lines, actual_lines = expected.split("\n"), actual.split("\n")
+    for number, (want, got) in enumerate(zip(expected_lines, actual_lines), 1):
+        if want != got:
+            return f"line {number}: expected {want!r}, got {got!r}"
+    return f"length differs: expected {len(expected_lines)} lines, got {len(actual_lines)}"
+
+
+def _percentile(values: list[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def benchmark(transcript_file: str, repeat: int = 1) -> dict:
+    """
+    Replay one transcript repeat times.
+
+    Returns:
+        dict: level, turns, match flag, first difference, and mean/p95
+                model and render milliseconds per turn.
+    """
+    with open(transcript_file, "r", encoding="utf-8") as fh:
+        transcript = fh.read()
+    if not transcript.endswith("\n"):
+        transcript += "\n"  # the final typed command has no newline on disk
+
+    level = find_start_level(transcript, os.path.join(ROOT, "levels"))
+    if level is None:
+        return {"transcript": transcript_file, "level": None}
+    commands = transcript_commands(transcript)
+
+    model_ms, render_ms = [], []
+    for _ in range(repeat):
+        output, timer = replay(level, commands)
+        model_ms += [model * 1000 for model, _ in timer.turns]
+        render_ms += [render * 1000 for _, render in timer.turns]
+
+    return {
+        "transcript": transcript_file,
+        "level": os.path.relpath(level, ROOT),
+        "turns": len(timer.turns),
+        "match": output == transcript,
+        "difference": first_difference(transcript, output),
+        "model_mean": statistics.fmean(model_ms),
+        "model_p95": _percentile(model_ms, 0.95),
+        "render_mean": statistics.fmean(render_ms),
+        "render_p95": _percentile(render_ms, 0.95),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Replay gameplay transcripts as a benchmark.")
+    parser.add_argument("transcripts", nargs="*",
+                        default=sorted(glob.glob(os.path.join(ROOT, "gameplay", "*.txt"))))
+    parser.add_argument("--repeat", type=int, default=5, help="replays per transcript")
+    args = parser.parse_args()
+
+    print(f"{'transcript':<22}{'level':<20}{'turns':>6}{'match':>7}"
+          f"{'model ms':>10}{'p95':>8}{'render ms':>11}{'p95':>8}")
+    failed = False
+    for transcript_file in args.transcripts:
+        result = benchmark(transcript_file, args.repeat)
+        name = os.path.basename(transcript_file)
+        if result["level"] is None:
+            print(f"{name:<22}no matching starting level")
+            failed = True
+            continue
+        print(f"{name:<22}{result['level']:<20}{result['turns']:>6}"
+              f"{'yes' if result['match'] else 'NO':>7}"
+              f"{result['model_mean']:>10.3f}{result['model_p95']:>8.3f}"
+              f"{result['render_mean']:>11.3f}{result['render_p95']:>8.3f}")
+        if result["match"]:
+            continue
+        if result["difference"] == KNOWN_DIVERGENCES.get(name):
+            print(f"    known divergence, {result['difference']}")
+        else:
+            print(f"    {result['difference']}")
+            failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
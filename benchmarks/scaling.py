@@ -0,0 +1,112 @@
+"""
+Measure how level loading, turns and rendering scale with level size.
+
+Square levels of increasing size are generated with levelgen (tank counts
+grow with the area), then for each one this records:
+    - load time and the memory retained by the loaded WTModel,
+    - mean time of a full turn (player wait plus enemy_actions),
+    - time of the first render and mean time of later renders.
+
+WTView is fixed at DISPLAY_WIDTH columns, so rendering is measured with a
+BattlefieldView on its own, which is where the cost grows with size.
+
+Usage:
+    python -m benchmarks.scaling [--sizes 25 50 100 200] [--json FILE]
+"""
+import argparse
+import gc
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import a2  # noqa: E402
+from display import BattlefieldView  # noqa: E402
+from levelgen import write_level  # noqa: E402
+
+TANKS_PER_CELL = 1 / 400
+
+
+def measure(size: int, turns: int = 10, renders: int = 5, seed: int = 0) -> dict:
+    """
+    Benchmark one generated size x size level.
+
+    Returns:
+        dict: size, cells, tanks, load_s, memory_bytes, turn_s,
+                first_render_s and render_s.
+    """
+    tanks = max(2, int(size * size * TANKS_PER_CELL))
+    with tempfile.TemporaryDirectory() as scratch:
+        level = os.path.join(scratch, "level.txt")
+        write_level(level, rows=size, cols=size, guards=tanks // 2,
+                    patrols=tanks - tanks // 2, armour=10 ** 6, seed=seed)
+
+        gc.collect()
+        tracemalloc.start()
+        start = time.perf_counter()
+        model = a2.load_model(level)
+        load_s = time.perf_counter() - start
+        memory_bytes = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+    turn_times = []
+    for _ in range(turns):
+        start = time.perf_counter()
+        model.player_move("left")
+        model.enemy_actions()
+        turn_times.append(time.perf_counter() - start)
+
+    view = BattlefieldView(None)
+    battlefield = model.get_battlefield()
+    render_times = []
+    for _ in range(renders + 1):
+        start = time.perf_counter()
+        view.draw_tiles(battlefield.get_tiles())
+        view.draw_entities(model.get_player(), model.get_enemies())
+        view.render()
+        render_times.append(time.perf_counter() - start)
+        model.enemy_actions()
+
+    return {
+        "size": size,
+        "cells": size * size,
+        "tanks": tanks + 1,
+        "load_s": load_s,
+        "memory_bytes": memory_bytes,
+        "turn_s": statistics.fmean(turn_times),
+        "first_render_s": render_times[0],
+        "render_s": statistics.fmean(render_times[1:]),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Scaling benchmark for generated levels.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[25, 50, 100, 200])
+    parser.add_argument("--turns", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="also write results to this file as JSON")
+    args = parser.parse_args()
+
+    print(f"{'size':>6}{'tanks':>7}{'load ms':>10}{'memory KB':>11}"
+          f"{'turn ms':>10}{'1st render ms':>15}{'render ms':>11}")
+    results = []
+    for size in args.sizes:
+        result = measure(size, args.turns, seed=args.seed)
+        results.append(result)
+        print(f"{size:>6}{result['tanks']:>7}{result['load_s'] * 1000:>10.1f}"
+              f"{result['memory_bytes'] / 1024:>11.0f}{result['turn_s'] * 1000:>10.2f}"
+              f"{result['first_render_s'] * 1000:>15.1f}{result['render_s'] * 1000:>11.2f}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as fh:
+            json.dump(results, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Measure what a game start costs before and after the first frame.
+
+For each level this records the median of several runs of:
+    - validating the level (a2.load_file),
+    - creating a WTController for it,
+    - the first frame (controller.start, which builds the view),
+    - building a WTView on its own, the cost a controller used to pay up front,
+and counts the views built per controller before and after its first frame,
+which should be none and one.
+Frames go to a MemorySink, so nothing is printed.
+
+It also times whole processes: "python play.py LEVEL --check", which only
+validates, against "--script /dev/null --final-only", which draws one frame.
+a2 imports display unconditionally, so both pay for importing it.
+
+Usage:
+    python -m benchmarks.startup [LEVEL ...] [--repeat N] [--processes N]
+"""
+import argparse
+import glob
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import a2  # noqa: E402
+from display import MemorySink, WTView  # noqa: E402
+
+
+class CountingFactory:
+    """View factory that counts the views it builds."""
+
+    def __init__(self, view_factory=WTView):
+        self._view_factory = view_factory
+        self.built = 0
+
+    def __call__(self):
+        self.built += 1
+        return self._view_factory()
+
+
+def _median_time(func, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def measure(level: str, repeat: int = 20) -> dict:
+    """
+    Benchmark starting a game of one level in this process.
+
+    Returns:
+        dict: level, validate_s, controller_s, first_frame_s, view_s,
+                views_before_frame and views_after_frame.
+    """
+    validate_s = _median_time(lambda: a2.load_file(level), repeat)
+    model = a2.load_file(level)
+
+    factory = CountingFactory()
+    controllers = []
+    controller_s = _median_time(
+        lambda: controllers.append(a2.WTController(model, factory, sink=MemorySink())),
+        repeat)
+    views_before_frame = factory.built / len(controllers)
+
+    frame_times = []
+    for controller in controllers:
+        start = time.perf_counter()
+        controller.start()
+        frame_times.append(time.perf_counter() - start)
+
+    return {
+        "level": level,
+        "validate_s": validate_s,
+        "controller_s": controller_s,
+        "first_frame_s": statistics.median(frame_times),
+        "view_s": _median_time(WTView, repeat),
+        "views_before_frame": views_before_frame,
+        "views_after_frame": factory.built / len(controllers),
+    }
+
+
+def time_process(args: list[str], repeat: int) -> float:
+    """Median wall time of running play.py with args in a fresh interpreter."""
+    command = [sys.executable, os.path.join(ROOT, "play.py")] + args
+    return _median_time(
+        lambda: subprocess.run(command, check=True, stdout=subprocess.DEVNULL),
+        repeat)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Startup benchmark for We Tank!")
+    parser.add_argument("levels", nargs="*",
+                        help="levels to start (default: the valid levels in levels/)")
+    parser.add_argument("--repeat", type=int, default=20, help="runs per measurement")
+    parser.add_argument("--processes", type=int, default=5,
+                        help="runs per whole-process measurement, 0 to skip")
+    args = parser.parse_args()
+
+    levels = args.levels or sorted(
+        level for level in glob.glob(os.path.join(ROOT, "levels", "level*.txt"))
+        if "invalid" not in os.path.basename(level)
+    )
+
+    print(f"{'level':<14}{'validate ms':>13}{'controller ms':>15}{'views':>7}"
+          f"{'1st frame ms':>14}{'views':>7}{'WTView ms':>11}")
+    for level in levels:
+        result = measure(level, args.repeat)
+        print(f"{os.path.basename(level):<14}{result['validate_s'] * 1000:>13.3f}"
+              f"{result['controller_s'] * 1000:>15.3f}{result['views_before_frame']:>7g}"
+              f"{result['first_frame_s'] * 1000:>14.3f}{result['views_after_frame']:>7g}"
+              f"{result['view_s'] * 1000:>11.3f}")
+
+    if args.processes:
+        level = levels[0]
+        check_s = time_process([level, "--check"], args.processes)
+        frame_s = time_process([level, "--script", os.devnull, "--final-only"],
+                               args.processes)
+        print(f"\n{os.path.basename(level)} whole process: --check {check_s * 1000:.1f} ms, "
+              f"one frame {frame_s * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,6 @@
+import os
+import sys
+
 from support import *
 
 # Display helper components, you can probably ignore these ---------------------
@@ -11,6 +14,91 @@ class DisplayException(Exception):
                  *args, **kwargs):
         super().__init__(curr_element.get_trace() + message, *args, **kwargs)
 
+class OutputSink():
+    """
+    Collects text written by the controller and views, and sends it to a 
+    stream in a single write when flushed. The controller flushes before it 
+    reads input, so each turn's output costs one write.
+    """
+    def __init__(self, stream=None):
+        """
+        Initialise a new, empty OutputSink.
+
+        Args:
+            stream: Text stream to flush into. Defaults to whatever sys.stdout
+                    is at the time of each flush.
+        """
+        self._stream = stream
+        self._pending: list[str] = []
+        self._preamble = ""
+
+    def set_preamble(self, text: str):
+        """
+        Write text at the start of every flush that has something to write,
+        e.g. an escape that clears the previous turn's messages.
+        """
+        self._preamble = text
+
+    def get_stream(self):
+        """
+        Returns:
+            The stream this sink flushes into.
+        """
+        return self._stream if self._stream is not None else sys.stdout
+
+    def write(self, text: str):
+        """
+        Buffer text until the next flush.
+        """
+        self._pending.append(text)
+
+    def flush(self):
+        """
+        Write everything buffered to the stream in one call.
+        """
+        if self._pending:
+            stream = self.get_stream()
+            stream.write(self._preamble + "".join(self._pending))
+            self._pending.clear()
+            stream.flush()
+
+    def take(self) -> str:
+        """
+        Return everything buffered and empty the sink without writing it.
+        """
+        text = "".join(self._pending)
+        self._pending.clear()
+        return text
+
+    def isatty(self) -> bool:
+        """
+        Returns:
+            bool: True if this sink flushes into a terminal.
+        """
+        try:
+            return self.get_stream().isatty()
+        except (AttributeError, ValueError):
+            return False
+
+class MemorySink(OutputSink):
+    """
+    OutputSink that keeps everything in memory, for tests and servers.
+    """
+    def flush(self):
+        """
+        Nothing to do: text stays buffered until taken.
+        """
+
+    def isatty(self) -> bool:
+        return False
+
+    def getvalue(self) -> str:
+        """
+        Returns:
+            str: Everything written so far.
+        """
+        return "".join(self._pending)
+
 class TextDisplayElement():
     """
     Base (Abstract) text gui element to display a rectangular block of text.
@@ -28,6 +116,12 @@ class TextDisplayElement():
     together, calling its own justify method on the result, and returning.
     Elements should not change parent after construction.
 
+    Resolved widths and heights are cached by get_width and get_height. The 
+    cache is invalidated up the parent chain whenever geometry or content is 
+    changed through the setters (set_width, set_height, set_content, append, 
+    insert, remove, pop). Code that mutates content or components in place 
+    should call invalidate_layout afterwards.
+
     This class should not be instantiated directly, and should instead be 
     subclassed. Subclasses should override the render method with intended 
     functionality.
@@ -69,6 +163,8 @@ class TextDisplayElement():
         self._parent = parent
         self._fixwidth = width
         self._fixheight = height
+        self._cached_width: int | None = None
+        self._cached_height: int | None = None
 
         self.set_vjust(vjust)
         self.set_hjust(hjust)
@@ -93,6 +189,21 @@ class TextDisplayElement():
         """
         return self._parent
 
+    def invalidate_layout(self):
+        """
+        Discard the cached width and height of this element and of every 
+        element it is nested inside of.
+        """
+        element = self
+        while element is not None:
+            if element._cached_width is None and element._cached_height is None:
+                # Ancestors measured since the last invalidation would have 
+                # re-filled this cache, so they cannot be stale either.
+                break
+            element._cached_width = None
+            element._cached_height = None
+            element = element._parent
+
     def set_width(self, width: int | None = None):
         """
         Set or remove fixed width. Removing fixed width means width stretches to
@@ -103,11 +214,23 @@ class TextDisplayElement():
                     fixed width. Optional; Defaults to None.
         """
         self._fixwidth = width
+        self.invalidate_layout()
 
     def get_width(self) -> int:
         """
         Returns current content width.
 
+        Returns:
+            int: current content width.
+        """
+        if self._cached_width is None:
+            self._cached_width = self._measure_width()
+        return self._cached_width
+
+    def _measure_width(self) -> int:
+        """
+        Resolve this element's width, ignoring any cached value.
+
         Returns:
             int: current content width.
         """
@@ -126,11 +249,23 @@ class TextDisplayElement():
                     remove fixed height. Optional; Defaults to None.
         """
         self._fixheight = height
+        self.invalidate_layout()
 
     def get_height(self) -> int:
         """
         Returns current content height.
 
+        Returns:
+            int: current content height.
+        """
+        if self._cached_height is None:
+            self._cached_height = self._measure_height()
+        return self._cached_height
+
+    def _measure_height(self) -> int:
+        """
+        Resolve this element's height, ignoring any cached value.
+
         Returns:
             int: current content height.
         """
@@ -175,10 +310,11 @@ class TextDisplayElement():
         Returns:
             list[str]: Padded and justified copy of given content.
         """
+        width = self.get_width()
         # pad content horizonally
         to_render = []
         for line in content:
-            hdiff = self.get_width() - len(line)
+            hdiff = width - len(line)
             if hdiff < 0:
                 raise DisplayException(self, "Content too wide!")
             if self._hjust == self.HJUST_LEFT:
@@ -195,15 +331,15 @@ class TextDisplayElement():
         if vdiff < 0:
             raise DisplayException(self, "Content too tall!")
         if self._vjust == self.VJUST_TOP:
-            to_render += [" " * self.get_width()] * vdiff
+            to_render += [" " * width] * vdiff
         elif self._vjust == self.VJUST_BOTTOM:
-            to_render = ([" " * self.get_width()] * vdiff) + to_render
+            to_render = ([" " * width] * vdiff) + to_render
         elif self._vjust == self.VJUST_CENTER:
             tpad = vdiff // 2
             bpad = vdiff - tpad
-            to_render = ([" " * self.get_width()] * tpad) + \
+            to_render = ([" " * width] * tpad) + \
                     to_render + \
-                    ([" " * self.get_width()] * bpad)
+                    ([" " * width] * bpad)
         
         return to_render
         
@@ -289,6 +425,7 @@ class BaseDisplay(TextDisplayElement):
             content (list[str]): Content to display.
         """
         self._content = content
+        self.invalidate_layout()
 
     def wrap_text(self, text: str) -> list[str]:
         """
@@ -372,6 +509,7 @@ class VSplitDisplay(TextDisplayElement):
             component (TextDisplayElement): Component to append.
         """
         self._components.append(component)
+        self.invalidate_layout()
 
     def remove(self, component: TextDisplayElement):
         """
@@ -381,6 +519,7 @@ class VSplitDisplay(TextDisplayElement):
             component (TextDisplayElement): Component to remove.
         """
         self._components.remove(component)
+        self.invalidate_layout()
 
     def insert(self, index: int, component: TextDisplayElement):
         """
@@ -391,6 +530,7 @@ class VSplitDisplay(TextDisplayElement):
             component (TextDisplayElement): Component to insert.
         """
         self._components.insert(index, component)
+        self.invalidate_layout()
 
     def pop(self, index: int) -> TextDisplayElement:
         """
@@ -402,7 +542,9 @@ class VSplitDisplay(TextDisplayElement):
         Returns:
             component (TextDisplayElement): popped component.
         """
-        return self._components.pop(index)
+        component = self._components.pop(index)
+        self.invalidate_layout()
+        return component
     
     def index(self, component: TextDisplayElement) -> int:
         """
@@ -416,7 +558,7 @@ class VSplitDisplay(TextDisplayElement):
         """
         return self._components.index(component)
 
-    def get_width(self) -> int:
+    def _measure_width(self) -> int:
         if self._fixwidth:
             return self._fixwidth
         else:
@@ -425,7 +567,7 @@ class VSplitDisplay(TextDisplayElement):
                 default= 0
             )
         
-    def get_height(self) -> int:
+    def _measure_height(self) -> int:
         if self._fixheight:
             return self._fixheight
         else:
@@ -497,6 +639,7 @@ class HSplitDisplay(TextDisplayElement):
             component (TextDisplayElement): Component to append.
         """
         self._components.append(component)
+        self.invalidate_layout()
 
     def remove(self, component: TextDisplayElement):
         """
@@ -506,6 +649,7 @@ class HSplitDisplay(TextDisplayElement):
             component (TextDisplayElement): Component to remove.
         """
         self._components.remove(component)
+        self.invalidate_layout()
 
     def insert(self, index: int, component: TextDisplayElement):
         """
@@ -516,6 +660,7 @@ class HSplitDisplay(TextDisplayElement):
             component (TextDisplayElement): Component to insert.
         """
         self._components.insert(index, component)
+        self.invalidate_layout()
 
     def pop(self, index: int) -> TextDisplayElement:
         """
@@ -527,7 +672,9 @@ class HSplitDisplay(TextDisplayElement):
         Returns:
             component (TextDisplayElement): popped component.
         """
-        return self._components.pop(index)
+        component = self._components.pop(index)
+        self.invalidate_layout()
+        return component
     
     def index(self, component: TextDisplayElement) -> int:
         """
@@ -542,13 +689,13 @@ class HSplitDisplay(TextDisplayElement):
         return self._components.index(component)
     
 
-    def get_width(self) -> int:
+    def _measure_width(self) -> int:
         if self._fixwidth:
             return self._fixwidth
         else:
             return sum((component.get_width() for component in self._components))
         
-    def get_height(self) -> int:
+    def _measure_height(self) -> int:
         if self._fixheight:
             return self._fixheight
         else:
@@ -558,12 +705,13 @@ class HSplitDisplay(TextDisplayElement):
             )
 
     def render(self):
-        to_render = ["" for _ in range(self.get_height())]
+        height = self.get_height()
+        to_render = ["" for _ in range(height)]
 
         for component in self._components:
             new_content = component.render()
             # will need to pad vertically early
-            vdiff = self.get_height() - len(new_content)
+            vdiff = height - len(new_content)
             if vdiff < 0:
                 raise DisplayException(self, "Component is too tall!")
             if self._vjust == self.VJUST_TOP:
@@ -578,7 +726,7 @@ class HSplitDisplay(TextDisplayElement):
                         [" " * component.get_width()] * bpad
             
             #stitch lines together
-            for line in range(self.get_height()):
+            for line in range(height):
                 to_render[line] += new_content[line]
 
         return self.justify(to_render)
@@ -660,6 +808,24 @@ class AbstractGrid(VSplitDisplay):
         super().set_height(height)
         self.set_dims(self._dims) # Reconstruct grid with new geometry
 
+    def set_geometry(self, width: int, height: int, dims: tuple[int, int]):
+        """
+        Set fixed width, fixed height and grid dimensions together, 
+        reconstructing the grid once instead of once per setter. 
+        Warning: wipes content.
+
+        Args:
+            width (int): New fixed width.
+            height (int): New fixed height.
+            dims (tuple[int, int]): new grid dimensions (rows, columns)
+        """
+        if not width or not height:
+            raise self._FIXED_GEO_ERR
+        self._fixwidth = width
+        self._fixheight = height
+        self.invalidate_layout()
+        self.set_dims(dims)
+
     def get_dims(self) -> tuple[int, int]: # warning: wipes
         """
         Return grid dimensions.
@@ -683,6 +849,7 @@ class AbstractGrid(VSplitDisplay):
         cell_width = self._fixwidth // dims[1]
 
         self.components().clear()
+        self.invalidate_layout()
         for _ in range(dims[0]):
             if self._grid_just == self.GRID_SQUARE:
                 min_dim = min(cell_height, cell_width)
@@ -755,6 +922,33 @@ def get_tank_display(heading: Heading, id: str) -> list[str]:
     display = TANK_MAP[heading].copy() # Copy as mutating
     display[1] = display[1][0] + id + display[1][2]
     return display
+
+
+# Display of every cell key drawn by the battlefield views: None for blank, 
+# each tile id, and a (heading, id) pair for each heading and tank id. Built
+# once at import and shared between cells, so the lists must not be mutated.
+CELL_DISPLAYS = {None: [], **TILE_MAP}
+CELL_DISPLAYS.update({
+    (heading, id): get_tank_display(heading, id)
+    for heading in TANK_MAP
+    for id in (PLAYER_ID, GUARD_ID, PATROL_ID, ENEMY_ID, TANK_ID)
+})
+
+
+def get_cell_display(key) -> list[str]:
+    """
+    Return the display for a cell key, from CELL_DISPLAYS where possible.
+
+    Args:
+        key: tile id, (heading, tank id) pair, or None for blank.
+
+    Returns:
+        list[str]: Rows of the cell, which must not be mutated.
+    """
+    display = CELL_DISPLAYS.get(key)
+    if display is None:
+        display = TILE_MAP[key] if isinstance(key, str) else get_tank_display(*key)
+    return display
     
 
 
@@ -762,6 +956,12 @@ def get_tank_display(heading: Heading, id: str) -> list[str]:
 class BattlefieldView(AbstractGrid):
     """
     View component to display the game grid with entities on it.
+
+    The grid is retained between frames while the battlefield dimensions stay 
+    the same. Each cell remembers what it is currently showing, so only cells 
+    whose tile or tank changed get new content, and only grid rows containing 
+    such cells are re-rendered. Cells should therefore be drawn through 
+    draw_tiles and draw_entities rather than edited directly.
     """
     CELL_SIZE = 3
 
@@ -776,10 +976,45 @@ class BattlefieldView(AbstractGrid):
         # Dummy initial dims, will be filled out upon adding tiles.
         super().__init__(parent, (1,1), 1, 1, AbstractGrid.GRID_SQUARE)
 
+    def set_dims(self, dims: tuple[int, int]): #Warning, wipes content
+        super().set_dims(dims)
+        rows, cols = dims
+        # Key of what each cell shows: a tile id, a (heading, id) tank pair, 
+        # or None for an empty cell.
+        self._cell_keys = [[None] * cols for _ in range(rows)]
+        self._tile_keys = [[None] * cols for _ in range(rows)]
+        self._tank_cells: list[Position] = []
+        # (row, col) -> key the cell held when its row was last rendered.
+        self._dirty: dict[Position, object] = {}
+        self._row_cache: list[list[str] | None] = [None] * rows
+
+    def _draw_cell(self, row: int, col: int, key):
+        """
+        Point the cell at (row, col) at the display for key, if it is not 
+        already showing it.
+
+        Args:
+            row (int): row index
+            col (int): column index
+            key: tile id, (heading, tank id) pair, or None for blank.
+        """
+        keys = self._cell_keys[row]
+        if keys[col] == key:
+            return
+        if (row, col) not in self._dirty:
+            self._dirty[(row, col)] = keys[col]
+        keys[col] = key
+
+        self.get_cell(row, col).set_content(get_cell_display(key))
+
     def draw_tiles(self, tiles: list[list["Tile"]]):
         """
         Draws the current set of tiles ready for render.
 
+        The grid is only reconstructed when the battlefield dimensions change;
+        otherwise only cells whose tile changed since the last call are 
+        redrawn. Tanks drawn by the previous draw_entities call are cleared.
+
         Precondition: tiles actually contains at least one tile.
 
         Args:
@@ -787,17 +1022,31 @@ class BattlefieldView(AbstractGrid):
             rows.
         """
 
-        # Reconfigure Size (Wiping existing content)
+        # Reconfigure Size (Wiping existing content) only if it changed
         rows = len(tiles)
         cols = max(len(row) for row in tiles) # Ideally things are rectangular.
-        self.set_height(rows * self.CELL_SIZE)
-        self.set_width(cols * self.CELL_SIZE)
-        self.set_dims((rows, cols)) 
+        width = cols * self.CELL_SIZE
+        height = rows * self.CELL_SIZE
+        if (self.get_dims() != (rows, cols) or self._fixwidth != width 
+                or self._fixheight != height):
+            self.set_geometry(width, height, (rows, cols))
 
         # Actually draw
         for i,row in enumerate(tiles):
+            tile_keys = self._tile_keys[i]
             for j,tile in enumerate(row):
-                self.get_cell(i,j).set_content(TILE_MAP[str(tile)])
+                tile_id = str(tile)
+                if tile_keys[j] != tile_id:
+                    tile_keys[j] = tile_id
+                    self._draw_cell(i, j, tile_id)
+            for j in range(len(row), cols):
+                tile_keys[j] = None
+                self._draw_cell(i, j, None)
+
+        # Uncover tiles underneath the previously drawn tanks
+        for i, j in self._tank_cells:
+            self._draw_cell(i, j, self._tile_keys[i][j])
+        self._tank_cells = []
 
     def draw_entities(self, player: "Player", enemies: list["Enemy"]):
         """
@@ -814,9 +1063,27 @@ class BattlefieldView(AbstractGrid):
         """
 
         for tank in [player] + enemies:
-            self.get_cell(*tank.get_position()).set_content(
-                    get_tank_display(tank.get_heading(), tank.get_id())
-            )
+            row, col = tank.get_position()
+            self._draw_cell(row, col, (tank.get_heading(), tank.get_id()))
+            self._tank_cells.append((row, col))
+
+    def render(self) -> list[str]:
+        """
+        Re-render only the grid rows holding cells that changed since the 
+        last render, reusing the cached lines of every other row.
+        """
+        row_cache = self._row_cache
+        for (i, j), previous in self._dirty.items():
+            if self._cell_keys[i][j] != previous:
+                row_cache[i] = None
+        self._dirty.clear()
+
+        content = []
+        for i, row in enumerate(self.components()):
+            if row_cache[i] is None:
+                row_cache[i] = row.render()
+            content += row_cache[i]
+        return self.justify(content)
 
 class StatView(HSplitDisplay):
     """
@@ -889,6 +1156,25 @@ class WTView(VSplitDisplay):
         self.append(self._battlefield)
         self._stats = StatView(self, DISPLAY_WIDTH)
         self.append(self._stats)
+        self._sink = OutputSink()
+        self._owns_sink = True  # Flush after each frame until set_sink
+
+    def get_sink(self) -> OutputSink:
+        return self._sink
+
+    def set_sink(self, sink: OutputSink):
+        """
+        Write frames into sink from now on, leaving flushing it to the 
+        caller. Passing get_sink() keeps the sink but stops the flushes.
+        """
+        self._sink = sink
+        self._owns_sink = False
+
+    def display(self):
+        """
+        Write this view into its sink.
+        """
+        self._sink.write(str(self) + "\n")
 
     def draw_game(self, 
                     tiles: list[list["Tile"]], 
@@ -898,6 +1184,8 @@ class WTView(VSplitDisplay):
         """
         Print the current game state in a visually appealing format.
 
+        The frame is flushed straight away while the view uses its own sink;
+        after set_sink it stays buffered until the sink is flushed.
         If multiple entities exist at the same position, the draw order is the 
         player followed by each enemy in descending priority order.
         Preconditions: tiles contains at least one tile; and all tanks (player 
@@ -914,3 +1202,330 @@ class WTView(VSplitDisplay):
         self._battlefield.draw_entities(player, enemies)
         self._stats.draw_stats(player.get_armour(), len(enemies))
         self.display()
+        if self._owns_sink:
+            self._sink.flush()
+
+
+class TerminalDiffWriter():
+    """
+    Turns successive frames into the ANSI output that updates a terminal from 
+    the previous frame to the next one.
+
+    The frame is kept at the top of the screen, and the game's prompts and 
+    messages are printed below it. Only the changed runs of changed rows are
+    rewritten, using cursor-positioning escapes between a save and a restore
+    of the cursor, so messages written before and after a frame stay in order.
+    The messages are cleared by clear_messages, once per turn.
+    """
+    CURSOR_HOME = "\x1b[H"
+    SAVE_CURSOR = "\x1b7"
+    RESTORE_CURSOR = "\x1b8"
+    CLEAR_SCREEN = "\x1b[2J"
+    CLEAR_BELOW = "\x1b[J"
+    CLEAR_LINE_END = "\x1b[K"
+    # Unchanged runs shorter than this are resent rather than skipped, since 
+    # a cursor move costs about as many bytes
+    MERGE_GAP = 8
+
+    def __init__(self):
+        """
+        Initialise a new TerminalDiffWriter with no previous frame.
+        """
+        self._previous: list[str] | None = None
+
+    def reset(self):
+        """
+        Forget the previous frame, so the next one is drawn in full.
+        """
+        self._previous = None
+
+    def needs_redraw(self, lines: list[str]) -> bool:
+        """
+        Return True if update will clear the screen and draw lines in full.
+        """
+        return self._previous is None or len(self._previous) != len(lines)
+
+    def clear_messages(self) -> str:
+        """
+        Return the escapes that move to the line below the previous frame and
+        clear everything from there down, or "" if there is no previous frame.
+        """
+        if self._previous is None:
+            return ""
+        return f"\x1b[{len(self._previous) + 1};1H{self.CLEAR_BELOW}"
+
+    def update(self, lines: list[str]) -> str:
+        """
+        Return the output that turns the previous frame into lines.
+
+        Args:
+            lines (list[str]): Rows of the new frame, top to bottom.
+
+        Returns:
+            str: Text with ANSI escapes to write to the terminal. A full 
+                    redraw leaves the cursor on the line below the frame, and
+                    other updates leave it where it was.
+        """
+        previous = self._previous
+        self._previous = list(lines)
+        if previous is None or len(previous) != len(lines):
+            return self.CURSOR_HOME + self.CLEAR_SCREEN + "\n".join(lines) + "\n"
+        out = []
+        for row, (old, new) in enumerate(zip(previous, lines)):
+            if old != new:
+                out.extend(self._row_update(row, old, new))
+        if not out:
+            return ""
+        return self.SAVE_CURSOR + "".join(out) + self.RESTORE_CURSOR
+
+    def _row_update(self, row: int, old: str, new: str) -> list[str]:
+        """
+        Return the escapes and text that rewrite the changed runs of a row.
+        """
+        width = min(len(old), len(new))
+        out = []
+        start = end = None
+        for col in range(width):
+            if old[col] == new[col]:
+                continue
+            if start is not None and col - end > self.MERGE_GAP:
+                out.append(f"\x1b[{row + 1};{start + 1}H{new[start:end]}")
+                start = None
+            if start is None:
+                start = col
+            end = col + 1
+        if len(old) != len(new):
+            # The tail differs in length: rewrite it and clear what is left
+            if start is None:
+                start = width
+            end = len(new)
+        if start is not None:
+            out.append(f"\x1b[{row + 1};{start + 1}H{new[start:end]}")
+            if len(new) < len(old):
+                out.append(self.CLEAR_LINE_END)
+        return out
+
+
+class TerminalView(WTView):
+    """
+    WTView that, on a terminal, redraws only what changed since the previous
+    frame using ANSI cursor addressing. When stdout is not a terminal, or the
+    terminal is too short to keep the frame and the messages below it on 
+    screen, frames are printed in full exactly as WTView prints them.
+    """
+    # Lines kept free under the frame for prompts and messages (HELP_MSG)
+    MESSAGE_ROOM = len(HELP_MSG.splitlines()) + 2
+
+    def __init__(self):
+        """
+        Initialise a new TerminalView.
+        """
+        super().__init__()
+        self._writer = TerminalDiffWriter()
+
+    def _fits_terminal(self, height: int) -> bool:
+        """
+        Return True if the sink flushes into a terminal with room for a frame
+        of the given height plus MESSAGE_ROOM lines.
+        """
+        if not self._sink.isatty():
+            return False
+        try:
+            rows = os.get_terminal_size(self._sink.get_stream().fileno()).lines
+        except (AttributeError, OSError, ValueError):
+            return False
+        return height + self.MESSAGE_ROOM <= rows
+
+    def display(self):
+        """
+        Write this view into its sink, only the changes when on a terminal.
+        """
+        lines = self.render()
+        if not self._fits_terminal(len(lines)):
+            self._writer.reset()
+            self._sink.set_preamble("")
+            self._sink.write("\n".join(lines) + "\n")
+            return
+        if self._writer.needs_redraw(lines):
+            # Clearing the screen would erase this turn's earlier messages, 
+            # so they are written again below the new frame
+            earlier = self._sink.take()
+            self._sink.write(self._writer.update(lines) + earlier)
+        else:
+            self._sink.write(self._writer.update(lines))
+        # Each turn's output starts by clearing the previous turn's messages
+        self._sink.set_preamble(self._writer.clear_messages())
+
+
+class FramebufferView():
+    """
+    Alternative to WTView that produces byte-identical frames without building
+    a TextDisplayElement per cell. The whole screen lives in one preallocated
+    bytearray; each tile and tank is written into it as three 3-character 
+    slices, and the finished frame is emitted with a single write.
+
+    Only cells whose tile or tank changed since the previous frame are 
+    rewritten. The buffer is reallocated when the battlefield dimensions 
+    change. All glyphs are assumed to be ASCII.
+    """
+    CELL_SIZE = BattlefieldView.CELL_SIZE
+
+    def __init__(self):
+        """
+        Initialise a new FramebufferView.
+        """
+        banner = BaseDisplay(None, [
+            "-"*DISPLAY_WIDTH,
+            "We Tank!",
+            "-"*DISPLAY_WIDTH,
+        ])
+        self._banner = [line.encode("ascii") for line in banner.render()]
+        self._stats = StatView(None, DISPLAY_WIDTH)
+        self._glyphs: dict[object, list[bytes]] = {}
+        self._dims: tuple[int, int] | None = None
+        self._sink = OutputSink()
+        self._owns_sink = True  # Flush after each frame until set_sink
+
+    def get_sink(self) -> OutputSink:
+        return self._sink
+
+    def set_sink(self, sink: OutputSink):
+        """
+        Write frames into sink from now on, leaving flushing it to the 
+        caller. Passing get_sink() keeps the sink but stops the flushes.
+        """
+        self._sink = sink
+        self._owns_sink = False
+
+    def get_trace(self) -> str:
+        """
+        Trace used by DisplayExceptions raised while drawing.
+
+        Returns:
+            str: String identifying this view.
+        """
+        return f"{self.__class__.__name__} > "
+
+    def _glyph(self, key) -> list[bytes]:
+        """
+        Return the three rendered rows of a cell, justified exactly as a 
+        BattlefieldView cell would be.
+
+        Args:
+            key: tile id, (heading, tank id) pair, or None for blank.
+
+        Returns:
+            list[bytes]: Rows of the cell, top to bottom.
+        """
+        glyph = self._glyphs.get(key)
+        if glyph is None:
+            cell = BaseDisplay(None, get_cell_display(key), 
+                               width=self.CELL_SIZE, height=self.CELL_SIZE)
+            glyph = [row.encode("ascii") for row in cell.render()]
+            self._glyphs[key] = glyph
+        return glyph
+
+    def _allocate(self, rows: int, cols: int):
+        """
+        Allocate a blank frame for a battlefield of the given dimensions.
+
+        Args:
+            rows (int): Battlefield rows.
+            cols (int): Battlefield columns.
+        """
+        grid_width = cols * self.CELL_SIZE
+        if grid_width > DISPLAY_WIDTH:
+            raise DisplayException(self, "Content too wide!")
+
+        self._dims = (rows, cols)
+        self._stride = DISPLAY_WIDTH + 1 # Each line is followed by a newline
+        self._grid_offset = len(self._banner) * self._stride + \
+                (DISPLAY_WIDTH - grid_width) // 2
+        self._stats_offset = (len(self._banner) + rows * self.CELL_SIZE) * \
+                self._stride
+        height = len(self._banner) + rows * self.CELL_SIZE + StatView.STAT_HEIGHT
+
+        blank_line = b" " * DISPLAY_WIDTH + b"\n"
+        self._buffer = bytearray(blank_line * height)
+        for i, line in enumerate(self._banner):
+            start = i * self._stride
+            self._buffer[start:start + DISPLAY_WIDTH] = line
+
+        self._cell_keys = [[None] * cols for _ in range(rows)]
+        self._tile_keys = [[None] * cols for _ in range(rows)]
+        self._tank_cells: list[Position] = []
+
+    def _draw_cell(self, row: int, col: int, key):
+        """
+        Write the glyph for key into the cell at (row, col), if it is not 
+        already showing it.
+
+        Args:
+            row (int): row index
+            col (int): column index
+            key: tile id, (heading, tank id) pair, or None for blank.
+        """
+        keys = self._cell_keys[row]
+        if keys[col] == key:
+            return
+        keys[col] = key
+
+        buffer = self._buffer
+        start = self._grid_offset + row * self.CELL_SIZE * self._stride + \
+                col * self.CELL_SIZE
+        for line in self._glyph(key):
+            buffer[start:start + self.CELL_SIZE] = line
+            start += self._stride
+
+    def draw_game(self, 
+                    tiles: list[list["Tile"]], 
+                    player: "Player",
+                    enemies: list["Enemy"]
+    ):
+        """
+        Print the current game state, identically to WTView.draw_game,
+        flushing in the same way.
+
+        Preconditions: tiles contains at least one tile; and all tanks (player 
+        and enemy) exist at positions that exist under the given set of tiles.
+
+        Args:
+            tiles (list[list[Tile]]): The structured set of tiles that compose 
+                    the current Battlefield. 
+            player (Player): The current player.
+            enemies (list[Creature]): List of enemies that are currently 
+                    alive within the game, in descending priorty order.
+        """
+        rows = len(tiles)
+        cols = max(len(row) for row in tiles)
+        if self._dims != (rows, cols):
+            self._allocate(rows, cols)
+
+        for i, row in enumerate(tiles):
+            tile_keys = self._tile_keys[i]
+            for j, tile in enumerate(row):
+                tile_id = str(tile)
+                if tile_keys[j] != tile_id:
+                    tile_keys[j] = tile_id
+                    self._draw_cell(i, j, tile_id)
+            for j in range(len(row), cols):
+                tile_keys[j] = None
+                self._draw_cell(i, j, None)
+
+        for i, j in self._tank_cells:
+            self._draw_cell(i, j, self._tile_keys[i][j])
+        self._tank_cells = []
+        for tank in [player] + enemies:
+            row, col = tank.get_position()
+            self._draw_cell(row, col, (tank.get_heading(), tank.get_id()))
+            self._tank_cells.append((row, col))
+
+        self._stats.draw_stats(player.get_armour(), len(enemies))
+        start = self._stats_offset
+        for line in self._stats.render():
+            self._buffer[start:start + DISPLAY_WIDTH] = line.encode("ascii")
+            start += self._stride
+
+        self._sink.write(self._buffer.decode("ascii"))
+        if self._owns_sink:
+            self._sink.flush()
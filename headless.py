@@ -0,0 +1,178 @@
+"""
+Headless batch runner for We Tank!
+
+Plays scripted games through a WTController that has no view and discards
+its output, and can fan many games out across processes. A script is a list of
+commands exactly as they would be typed at the prompt; invalid commands are
+skipped just as WTController re-prompts for them.
+
+Usage:
+    python headless.py LEVEL SCRIPT [SCRIPT ...] [-j WORKERS]
+
+Each SCRIPT is a text file with one command per line.
+"""
+import argparse
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, NamedTuple
+
+from a2 import PLAYER_MOVES, WTController
+from display import OutputSink
+from levelcache import LevelCache
+from support import *
+
+WON = "won"
+LOST = "lost"
+QUIT_EARLY = "quit"
+UNFINISHED = "unfinished"
+
+# Each worker process parses a level once and clones it for later games
+_LEVELS = LevelCache()
+
+# Commands that make the player act and are followed by the enemy phase
+PLAYER_ACTIONS = PLAYER_MOVES
+
+
+class _NullSink(OutputSink):
+    """OutputSink that throws everything away."""
+
+    def write(self, text: str):
+        pass
+
+    def flush(self):
+        pass
+
+
+class _NoView:
+    """Stands in for WTView so headless games draw nothing."""
+
+    def __init__(self):
+        self._sink = _NullSink()
+
+    def get_sink(self) -> OutputSink:
+        return self._sink
+
+    def set_sink(self, sink: OutputSink):
+        self._sink = sink
+
+    def draw_game(self, tiles, player, enemies):
+        pass
+
+
+class GameResult(NamedTuple):
+    """Outcome of one headless game."""
+    level: str
+    outcome: str
+    turns: int
+    final_state: str
+
+
+def run_game(level: str, commands: Iterable[str]) -> GameResult:
+    """
+    Play the given commands on a level without rendering anything.
+
+    Args:
+        level (str): Level file to load.
+        commands (Iterable[str]): Commands as typed at the prompt.
+
+    Returns:
+        GameResult: outcome (won, lost, quit or unfinished), the number of
+                turns the player took, and str() of the final model.
+    Raises:
+        ValueError: if the level file is invalid.
+        FileNotFoundError: if the level file does not exist.
+    """
+    controller = WTController(_LEVELS.load(level), _NoView, _LEVELS.load)
+    outcome = UNFINISHED
+    for command in commands:
+        if controller.is_game_over():
+            break
+        cmd = controller.parse_command(command)
+        if cmd is None:
+            continue
+        if not controller.handle_command(cmd):
+            outcome = QUIT_EARLY
+            break
+
+    model = controller.get_model()
+    if model.has_won():
+        outcome = WON
+    elif model.has_lost():
+        outcome = LOST
+    return GameResult(level, outcome, controller.get_turns(), str(model))
+
+
+def _run_job(job: tuple[str, list[str]]) -> GameResult:
+    return run_game(*job)
+
+
+class BatchReport:
+    """Aggregated results of a batch of headless games."""
+
+    def __init__(self, results: list[GameResult]):
+        self._results = results
+
+    def get_results(self) -> list[GameResult]:
+        return self._results
+
+    def outcomes(self) -> Counter:
+        """Number of games per outcome."""
+        return Counter(result.outcome for result in self._results)
+
+    def mean_turns(self) -> float:
+        if not self._results:
+            return 0.0
+        return sum(result.turns for result in self._results) / len(self._results)
+
+    def __str__(self) -> str:
+        lines = [f"Games: {len(self._results)}"]
+        for outcome, count in sorted(self.outcomes().items()):
+            lines.append(f"  {outcome}: {count}")
+        lines.append(f"Mean turns: {self.mean_turns():.1f}")
+        return "\n".join(lines)
+
+
+def run_batch(jobs: Iterable[tuple[str, list[str]]],
+              workers: int | None = None) -> BatchReport:
+    """
+    Run many headless games, spread over a process pool.
+
+    Args:
+        jobs (Iterable[tuple[str, list[str]]]): (level file, commands) pairs.
+        workers (int | None): Number of worker processes, or None for one per
+                core. 1 runs everything in this process.
+
+    Returns:
+        BatchReport: results in the same order as jobs.
+    """
+    jobs = list(jobs)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(jobs) <= 1:
+        return BatchReport([_run_job(job) for job in jobs])
+    chunksize = max(1, len(jobs) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return BatchReport(list(pool.map(_run_job, jobs, chunksize=chunksize)))
+
+
+def read_script(file: str) -> list[str]:
+    """Return the commands in a script file, one per line."""
+    with open(file, "r", encoding="utf-8") as fh:
+        return fh.read().splitlines()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run scripted We Tank! games headlessly.")
+    parser.add_argument("level", help="level file to play")
+    parser.add_argument("scripts", nargs="+", help="command files, one command per line")
+    parser.add_argument("-j", "--workers", type=int, default=None,
+                        help="worker processes (default: one per core)")
+    args = parser.parse_args()
+
+    report = run_batch(((args.level, read_script(script)) for script in args.scripts),
+                       args.workers)
+    print(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""
+Parsed-level cache for We Tank!
+
+A LevelCache keeps the immutable layout of recently loaded level files (tile
+ids and the initial tanks) and builds each requested WTModel from that
+template, so reloading an unchanged file skips parsing entirely. Entries are
+keyed by absolute path and checked against the file's size and modification
+time on every lookup, evicted least-recently-used first, and bounded both in
+number and in approximate memory.
+
+Usage:
+    cache = LevelCache()
+    model = cache.load("levels/level1.txt")
+    controller = WTController(model, loader=cache.load)
+"""
+import os
+import sys
+from collections import OrderedDict
+
+from a2 import (Battlefield, CompactBattlefield, Guard, Patrol, Player,
+                WTModel, load_file, make_tile)
+from support import Heading, Position
+
+DEFAULT_MAX_ENTRIES = 32
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# (tank id, position, heading, speed, armour); armour is None for enemies
+TankRecord = tuple[str, Position, Heading, int, int | None]
+
+_ENEMY_CLASSES = {Guard.TANK_ID: Guard, Patrol.TANK_ID: Patrol}
+
+
+class LevelTemplate:
+    """Immutable layout of a level from which fresh models are built."""
+
+    def __init__(self, model: WTModel):
+        """
+        Capture the layout of model.
+
+        Args:
+            model (WTModel): A freshly loaded model; later changes to it do
+                    not affect the template.
+        """
+        battlefield = model.get_battlefield()
+        if isinstance(battlefield, CompactBattlefield):
+            self._dims = battlefield.get_dims()
+            self._codes = battlefield.tile_codes()
+            self._rows = None
+        else:
+            self._dims = None
+            self._codes = None
+            self._rows = tuple(
+                "".join(str(tile) for tile in row) for row in battlefield.get_tiles()
+            )
+
+        player = model.get_player()
+        tanks = [(player.get_id(), player.get_position(), player.get_heading(),
+                  player.get_speed(), player.get_armour())]
+        tanks += [(enemy.get_id(), enemy.get_position(), enemy.get_heading(),
+                   enemy.get_speed(), None) for enemy in model.get_enemies()]
+        self._tanks: tuple[TankRecord, ...] = tuple(tanks)
+
+    def size(self) -> int:
+        """Approximate number of bytes held by this template."""
+        grid = sys.getsizeof(self._codes) if self._codes is not None \
+            else sum(sys.getsizeof(row) for row in self._rows)
+        return grid + sys.getsizeof(self._tanks) + 200 * len(self._tanks)
+
+    def instantiate(self) -> WTModel:
+        """Return a new WTModel in the template's initial state."""
+        if self._codes is not None:
+            battlefield = CompactBattlefield.from_codes(self._codes, *self._dims)
+        else:
+            battlefield = Battlefield([[make_tile(ch) for ch in row] for row in self._rows])
+
+        (_, position, heading, speed, armour), *enemies = self._tanks
+        player = Player(position, heading, speed, armour)
+        enemies = [
+            _ENEMY_CLASSES[tank_id](position, heading, speed)
+            for tank_id, position, heading, speed, _ in enemies
+        ]
+        return WTModel(battlefield, player, enemies)
+
+
+class LevelCache:
+    """LRU cache of LevelTemplates keyed by path, size and mtime."""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES,
+                 max_bytes: int = DEFAULT_MAX_BYTES, loader=load_file):
+        """
+        Args:
+            max_entries (int): Most templates kept at once.
+            max_bytes (int): Approximate memory cap for all templates. A
+                    single level larger than this is loaded but not cached.
+            loader: Callable used to parse a file on a miss. Defaults to
+                    a2.load_file.
+        """
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._loader = loader
+        # path -> (size, mtime_ns, template, template size)
+        self._entries: OrderedDict[str, tuple[int, int, LevelTemplate, int]] = OrderedDict()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+
+    def load(self, file: str) -> WTModel:
+        """
+        Return a fresh WTModel for file, parsing it only if it is not cached
+        or has changed on disk.
+
+        Raises:
+            ValueError: if the file contains invalid tiles, player, or enemy data.
+            FileNotFoundError: if the file does not exist.
+        """
+        path = os.path.abspath(file)
+        stat = os.stat(path)
+        entry = self._entries.get(path)
+        if entry is not None and entry[:2] == (stat.st_size, stat.st_mtime_ns):
+            self._hits += 1
+            self._entries.move_to_end(path)
+            return entry[2].instantiate()
+
+        self._misses += 1
+        self._discard(path)
+        model = self._loader(path)
+        template = LevelTemplate(model)
+        size = template.size()
+        if size <= self._max_bytes:
+            self._entries[path] = (stat.st_size, stat.st_mtime_ns, template, size)
+            self._bytes += size
+            self._evict()
+        return model
+
+    def _discard(self, path: str):
+        entry = self._entries.pop(path, None)
+        if entry is not None:
+            self._bytes -= entry[3]
+
+    def _evict(self):
+        while len(self._entries) > self._max_entries or self._bytes > self._max_bytes:
+            _, entry = self._entries.popitem(last=False)
+            self._bytes -= entry[3]
+
+    def clear(self):
+        """Drop every cached template. Counters are kept."""
+        self._entries.clear()
+        self._bytes = 0
+
+    def get_hits(self) -> int:
+        return self._hits
+
+    def get_misses(self) -> int:
+        return self._misses
+
+    def get_size(self) -> int:
+        """Approximate bytes held by cached templates."""
+        return self._bytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __str__(self) -> str:
+        return (f"{len(self)} levels, {self._bytes} bytes, "
+                f"{self._hits} hits, {self._misses} misses")
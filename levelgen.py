@@ -0,0 +1,110 @@
+"""
+Synthetic level generator for We Tank!
+
+Writes levels in the format read by load_model: a border of walls around a
+seeded random mix of floor, wall and rock tiles, followed by the player and
+the requested number of Guards and Patrols on distinct floor tiles.
+
+Usage:
+    python levelgen.py OUTPUT --rows 200 --cols 200 --guards 50 --patrols 50
+"""
+import argparse
+import random
+
+from support import *
+
+MAX_SIZE = 1000
+HEADINGS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+
+
+def generate_level(rows: int,
+                   cols: int,
+                   wall_density: float = 0.1,
+                   rock_density: float = 0.1,
+                   guards: int = 0,
+                   patrols: int = 0,
+                   armour: int = 3,
+                   seed: int = 0) -> str:
+    """
+    Return the text of a random level.
+
+    The same arguments always produce the same level.
+
+    Args:
+        rows (int): Battlefield rows, including the border (3 to MAX_SIZE).
+        cols (int): Battlefield columns, including the border (3 to MAX_SIZE).
+        wall_density (float): Chance that an inner tile is a wall.
+        rock_density (float): Chance that an inner tile is a rock.
+        guards (int): Number of Guards.
+        patrols (int): Number of Patrols.
+        armour (int): Player armour.
+        seed (int): Random seed.
+
+    Raises:
+        ValueError: if the size is out of range, the densities do not leave
+                room for floor, or there are fewer floor tiles than tanks.
+    """
+    if not (3 <= rows <= MAX_SIZE and 3 <= cols <= MAX_SIZE):
+        raise ValueError(f"rows and cols must be between 3 and {MAX_SIZE}")
+    if wall_density < 0 or rock_density < 0 or wall_density + rock_density >= 1:
+        raise ValueError("wall and rock densities must leave room for floor")
+
+    rng = random.Random(seed)
+    wall_cut = wall_density
+    rock_cut = wall_density + rock_density
+    grid = [[WALL_ID] * cols]
+    for _ in range(rows - 2):
+        row = [WALL_ID]
+        for _ in range(cols - 2):
+            roll = rng.random()
+            row.append(WALL_ID if roll < wall_cut else ROCK_ID if roll < rock_cut else FLOOR_ID)
+        row.append(WALL_ID)
+        grid.append(row)
+    grid.append([WALL_ID] * cols)
+
+    floor = [(r, c) for r in range(rows) for c in range(cols) if grid[r][c] == FLOOR_ID]
+    tanks = 1 + guards + patrols
+    if len(floor) < tanks:
+        raise ValueError(f"only {len(floor)} floor tiles for {tanks} tanks")
+    spots = rng.sample(floor, tanks)
+
+    def pose(pos: Position) -> str:
+        h_row, h_col = rng.choice(HEADINGS)
+        return f"{pos[0]},{pos[1]},{h_row},{h_col},0"
+
+    lines = [f"{PLAYER_ID},{pose(spots[0])},{armour}"]
+    kinds = [GUARD_ID] * guards + [PATROL_ID] * patrols
+    rng.shuffle(kinds)
+    lines += [f"{kind},{pose(pos)}" for kind, pos in zip(kinds, spots[1:])]
+
+    battlefield = "\n".join("".join(row) for row in grid)
+    return battlefield + "\n\n" + "\n".join(lines)
+
+
+def write_level(file: str, **kwargs):
+    """Write generate_level(**kwargs) to file."""
+    with open(file, "w", encoding="utf-8") as fh:
+        fh.write(generate_level(**kwargs))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate a random We Tank! level.")
+    parser.add_argument("output", help="file to write")
+    parser.add_argument("--rows", type=int, default=50)
+    parser.add_argument("--cols", type=int, default=50)
+    parser.add_argument("--walls", type=float, default=0.1, help="wall density")
+    parser.add_argument("--rocks", type=float, default=0.1, help="rock density")
+    parser.add_argument("--guards", type=int, default=10)
+    parser.add_argument("--patrols", type=int, default=10)
+    parser.add_argument("--armour", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    write_level(args.output, rows=args.rows, cols=args.cols,
+                wall_density=args.walls, rock_density=args.rocks,
+                guards=args.guards, patrols=args.patrols,
+                armour=args.armour, seed=args.seed)
+
+
+if __name__ == "__main__":
+    main()
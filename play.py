@@ -0,0 +1,62 @@
+"""
+Command-line entry point for We Tank!
+
+Plays a level interactively, or from a script of commands (one per line)
+through WTController.play_script, optionally drawing only the final state.
+--check only loads the level and reports whether it is valid, without
+creating a view.
+
+Usage:
+    python play.py LEVEL
+    python play.py LEVEL --script commands.txt [--final-only]
+    python play.py LEVEL --check
+    some-generator | python play.py LEVEL --script - --final-only
+"""
+import argparse
+import sys
+
+from a2 import load_file, play_game
+from display import FramebufferView, TerminalView, WTView
+from support import FILE_NOT_FOUND_MSG
+
+VIEWS = {
+    "text": WTView,
+    "terminal": TerminalView,
+    "framebuffer": FramebufferView,
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Play a We Tank! level.")
+    parser.add_argument("level", help="level file to play")
+    parser.add_argument("--script", help="file of commands to play instead of "
+                                         "prompting, '-' for stdin")
+    parser.add_argument("--final-only", action="store_true",
+                        help="with --script, draw only the final state")
+    parser.add_argument("--view", choices=VIEWS, default="text")
+    parser.add_argument("--check", action="store_true",
+                        help="only check that the level loads, drawing nothing")
+    args = parser.parse_args()
+
+    if args.check:
+        try:
+            load_file(args.level)
+        except FileNotFoundError:
+            sys.exit(f"{args.level}: {FILE_NOT_FOUND_MSG}")
+        except ValueError as e:
+            sys.exit(f"{args.level}: {e}")
+        print(f"{args.level}: ok")
+        return
+
+    view_factory = VIEWS[args.view]
+    if args.script is None:
+        play_game(args.level, view_factory)
+    elif args.script == "-":
+        play_game(args.level, view_factory, sys.stdin, not args.final_only)
+    else:
+        with open(args.script, "r", encoding="utf-8") as fh:
+            play_game(args.level, view_factory, fh, not args.final_only)
+
+
+if __name__ == "__main__":
+    main()
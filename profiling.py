@@ -0,0 +1,220 @@
+"""
+Opt-in per-phase profiling for We Tank!
+
+A Profiler wraps the WTController phases (reading a command, drawing,
+loading and saving), the hot WTModel methods and the view's draw_game with
+timers while it is installed, and restores the originals when it is removed.
+Nothing is wrapped unless a Profiler is installed, so a disabled profiler
+costs nothing.
+
+Each turn runs from one command prompt to the next. At the end of a turn the
+profiler writes one JSON line with the wall time and the calls and seconds of
+every phase that ran, and keeps a window of recent turns for percentiles.
+Times are inclusive, so advance_tank time is also counted in enemy_actions.
+
+Usage:
+    WT_PROFILE=turns.jsonl python profiling.py levels/level1.txt
+    python profiling.py levels/level1.txt --profile turns.jsonl
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from collections import deque
+from typing import TextIO
+
+import a2
+from display import WTView
+
+ENV_VAR = "WT_PROFILE"
+CONTROLLER_PHASES = ("get_command", "print_game", "load_game", "save_game")
+MODEL_METHODS = ("enemy_actions", "player_move", "player_fire",
+                 "advance_tank", "visible_positions")
+VIEW_PHASE = "draw_game"
+PERCENTILES = (50, 90, 99)
+
+
+class Profiler:
+    """Records per-turn call counts and wall time of game phases."""
+
+    def __init__(self, sink: TextIO | None = None, window: int = 1000,
+                 close_sink: bool = False):
+        """
+        Args:
+            sink (TextIO | None): Where each turn's JSON line is written, or
+                    None to keep records in memory only.
+            window (int): Number of recent turns used for percentiles.
+            close_sink (bool): Whether close() also closes sink.
+        """
+        self._sink = sink
+        self._close_sink = close_sink
+        self._window: deque[dict] = deque(maxlen=window)
+        self._patched: list[tuple[type, str, object]] = []
+        self._turn = 0
+        self._phases: dict[str, list] = {}  # name -> [calls, seconds]
+        self._turn_start = time.perf_counter()
+
+    # ---- Installation ----
+    def install(self, view_classes: tuple[type, ...] = (WTView,)):
+        """Wrap the controller, model and view_classes' draw_game with timers."""
+        if self._patched:
+            return
+        targets = [(a2.WTController, name) for name in CONTROLLER_PHASES]
+        targets += [(a2.WTModel, name) for name in MODEL_METHODS]
+        targets += [(view_class, VIEW_PHASE) for view_class in view_classes]
+        for owner, name in targets:
+            # None marks a method inherited by owner, removed again on uninstall
+            self._patched.append((owner, name, owner.__dict__.get(name)))
+            setattr(owner, name, self._timed(name, getattr(owner, name)))
+        self._turn_start = time.perf_counter()
+
+    def uninstall(self):
+        """Restore the original methods and record the unfinished turn."""
+        for owner, name, func in reversed(self._patched):
+            if func is None:
+                delattr(owner, name)
+            else:
+                setattr(owner, name, func)
+        self._patched.clear()
+        self.end_turn()
+
+    def __enter__(self) -> "Profiler":
+        self.install()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.uninstall()
+        self.close()
+
+    def close(self):
+        """Close the sink if this profiler owns it. Records stay available."""
+        if self._close_sink and self._sink is not None:
+            self._sink.close()
+            self._sink = None
+
+    def _timed(self, name: str, func):
+        phases = self._phases
+        starts_turn = name == "get_command"
+
+        def timed(*args, **kwargs):
+            if starts_turn:
+                self.end_turn()
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                stats = phases.get(name)
+                if stats is None:
+                    stats = phases[name] = [0, 0.0]
+                stats[0] += 1
+                stats[1] += time.perf_counter() - start
+
+        return timed
+
+    # ---- Records ----
+    def end_turn(self):
+        """Close the current turn, if anything ran in it, and start the next."""
+        now = time.perf_counter()
+        if self._phases:
+            record = {
+                "turn": self._turn,
+                "wall": now - self._turn_start,
+                "phases": {
+                    name: {"calls": calls, "seconds": seconds}
+                    for name, (calls, seconds) in self._phases.items()
+                },
+            }
+            self._window.append(record)
+            if self._sink is not None:
+                self._sink.write(json.dumps(record) + "\n")
+                self._sink.flush()
+            self._phases.clear()
+            self._turn += 1
+        self._turn_start = now
+
+    def get_records(self) -> list[dict]:
+        """Return the turns in the current window, oldest first."""
+        return list(self._window)
+
+    def percentiles(self, phase: str = "wall",
+                    points: tuple[int, ...] = PERCENTILES) -> dict[int, float]:
+        """
+        Return percentiles of seconds per turn for a phase over the window.
+
+        Args:
+            phase (str): A phase name, or "wall" for whole turns. Turns in
+                    which the phase did not run count as zero.
+            points (tuple[int, ...]): Percentiles to report, 0 to 100.
+        """
+        if phase == "wall":
+            values = [record["wall"] for record in self._window]
+        else:
+            values = [record["phases"].get(phase, {"seconds": 0.0})["seconds"]
+                      for record in self._window]
+        if not values:
+            return {point: 0.0 for point in points}
+        values.sort()
+        last = len(values) - 1
+        return {point: values[min(last, round(point / 100 * last))] for point in points}
+
+    def __str__(self) -> str:
+        names = ["wall"] + sorted({name for record in self._window
+                                   for name in record["phases"]})
+        lines = [f"{'phase':<20}" + "".join(f"{'p' + str(p) + ' ms':>11}" for p in PERCENTILES)]
+        for name in names:
+            values = self.percentiles(name)
+            lines.append(f"{name:<20}" + "".join(f"{values[p] * 1000:>11.3f}" for p in PERCENTILES))
+        return "\n".join(lines)
+
+
+def from_env(environ=os.environ) -> Profiler | None:
+    """
+    Return a Profiler writing to the file named by WT_PROFILE ("-" for
+    stderr), or None if the variable is unset or empty. The profiler owns
+    the file: close() or leaving its with block closes it.
+    """
+    target = environ.get(ENV_VAR)
+    if not target:
+        return None
+    if target == "-":
+        return Profiler(sys.stderr)
+    return Profiler(open(target, "a", encoding="utf-8"), close_sink=True)
+
+
+def play_game(file: str, view_factory=WTView, profiler: Profiler | None = None):
+    """
+    a2.play_game with profiling when a profiler is given or WT_PROFILE is set.
+
+    Percentiles are printed to stderr when the game ends.
+    """
+    profiler = profiler or from_env()
+    if profiler is None:
+        a2.play_game(file, view_factory)
+        return
+    view_classes = (view_factory,) if isinstance(view_factory, type) else (WTView,)
+    profiler.install(view_classes)
+    try:
+        a2.play_game(file, view_factory)
+    finally:
+        profiler.uninstall()
+        profiler.close()
+        print(profiler, file=sys.stderr)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Play a level with per-phase profiling.")
+    parser.add_argument("level", help="level file to play")
+    parser.add_argument("--profile", help=f"JSON lines output ('-' for stderr); "
+                                          f"defaults to ${ENV_VAR}")
+    args = parser.parse_args()
+
+    environ = dict(os.environ)
+    if args.profile:
+        environ[ENV_VAR] = args.profile
+    profiler = from_env(environ) or Profiler()
+    play_game(args.level, profiler=profiler)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+"""
+Line-based TCP game server for We Tank!
+
+Every connection gets its own WTModel and WTController and plays exactly as
+at the terminal: the server sends the frames and messages the controller
+prints, then COMMAND_PROMPT, and each line the client sends is one command
+with the usual vocabulary. Sessions are coroutines in a single event loop,
+so idle connections cost only their game state.
+
+save and load only see files directly inside the server's root directory:
+names with a directory part, and "." or "..", are refused, and a file that
+cannot be read or written is reported to the client instead of ending the
+session.
+
+Usage:
+    python server.py LEVEL [--host 127.0.0.1] [--port 8765] [--root DIR]
+    python server.py LEVEL --client "move forward" "fire" quit
+"""
+import argparse
+import asyncio
+import contextlib
+import os
+
+from a2 import WTController
+from display import MemorySink, WTView
+from levelcache import LevelCache
+from support import *
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+ENCODING = "utf-8"
+INVALID_FILE_NAME_MSG = "Invalid file name! Use a plain file name"
+FILE_ACCESS_MSG = "Cannot access the desired file!"
+
+
+class GameServer:
+    """Hosts one game of a level per TCP connection."""
+
+    def __init__(self, level: str, root: str = ".", view_factory=WTView):
+        """
+        Args:
+            level (str): Level every new session starts on.
+            root (str): Directory that save and load commands are confined to.
+            view_factory: Callable returning each session's view.
+        """
+        self._level = level
+        self._root = os.path.abspath(root)
+        self._view_factory = view_factory
+        self._levels = LevelCache()
+        self._sessions = 0
+
+    def get_session_count(self) -> int:
+        """Return the number of connected sessions."""
+        return self._sessions
+
+    def _confine(self, cmd: str) -> str | None:
+        """
+        Point a save or load command at a file inside the root directory.
+
+        Returns:
+            str | None: the command with the full path, or None if the name
+                    is not a plain file name.
+        """
+        action, filename = cmd.split(maxsplit=1)
+        separators = {os.sep, os.altsep or os.sep, "/"}
+        if filename in (os.curdir, os.pardir) or any(sep in filename for sep in separators):
+            return None
+        return f"{action} {os.path.join(self._root, filename)}"
+
+    async def handle_session(self, reader: asyncio.StreamReader,
+                             writer: asyncio.StreamWriter):
+        """Play one game over a connection until quit, game over or EOF."""
+        self._sessions += 1
+        try:
+            sink = MemorySink()
+            controller = WTController(self._levels.load(self._level),
+                                      self._view_factory, self._levels.load, sink)
+            controller.start()
+            writer.write(sink.take().encode(ENCODING))
+            while not controller.is_game_over():
+                writer.write(COMMAND_PROMPT.encode(ENCODING))
+                await writer.drain()
+                line = await reader.readline()
+                if not line:
+                    return  # Client went away
+                cmd = controller.parse_command(line.decode(ENCODING, "replace").rstrip("\r\n"))
+                if cmd is None:
+                    writer.write((INVALID_COMMAND_MSG + "\n").encode(ENCODING))
+                    continue
+                if cmd.startswith(SAVE + " ") or cmd.startswith(LOAD + " "):
+                    cmd = self._confine(cmd)
+                    if cmd is None:
+                        writer.write((INVALID_FILE_NAME_MSG + "\n").encode(ENCODING))
+                        continue
+                    try:
+                        playing = controller.handle_command(cmd)
+                    except OSError:
+                        # e.g. a directory, or a file the server may not touch
+                        controller.get_sink().write(FILE_ACCESS_MSG + "\n")
+                        playing = True
+                else:
+                    playing = controller.handle_command(cmd)
+                writer.write(sink.take().encode(ENCODING))
+                if not playing:
+                    return
+            controller.finish()
+            writer.write(sink.take().encode(ENCODING))
+        except ConnectionError:
+            pass
+        finally:
+            self._sessions -= 1
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+
+    async def start(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> asyncio.Server:
+        """Start listening. Port 0 picks a free port, see Server.sockets."""
+        return await asyncio.start_server(self.handle_session, host, port)
+
+
+async def play_remote(host: str, port: int, commands: list[str]) -> str:
+    """
+    Loopback client: send commands to a server and return everything it sent
+    back, with each command echoed after its prompt as a terminal would.
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    transcript = []
+    pending = list(commands)
+    prompt = COMMAND_PROMPT.encode(ENCODING)
+    buffer = b""
+    try:
+        while True:
+            chunk = await reader.read(65536)
+            if not chunk:
+                break
+            buffer += chunk
+            if buffer.endswith(prompt):
+                transcript.append(buffer.decode(ENCODING))
+                buffer = b""
+                if not pending:
+                    break
+                command = pending.pop(0)
+                transcript.append(command + "\n")
+                writer.write((command + "\n").encode(ENCODING))
+                await writer.drain()
+        transcript.append(buffer.decode(ENCODING))
+    finally:
+        writer.close()
+        await writer.wait_closed()
+    return "".join(transcript)
+
+
+async def _serve(args):
+    server = await GameServer(args.level, args.root).start(args.host, args.port)
+    if args.client is None:
+        host, port = server.sockets[0].getsockname()[:2]
+        print(f"Serving {args.level} on {host}:{port}")
+        async with server:
+            await server.serve_forever()
+    else:
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            print(await play_remote(args.host, port, args.client), end="")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve We Tank! games over TCP.")
+    parser.add_argument("level", help="level each new session starts on")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--root", default=".", help="directory for save and load")
+    parser.add_argument("--client", nargs="*", metavar="COMMAND",
+                        help="play these commands against a server on a free "
+                             "loopback port, print the session and exit")
+    args = parser.parse_args()
+    if args.client is not None:
+        args.port = 0
+    asyncio.run(_serve(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+"""
+Breadth-first solver for We Tank! levels.
+
+Searches over the turn-taking commands (move, turn, fire, wait) with WTModel
+as the simulator, one depth layer at a time. States are branched with
+WTModel.snapshot/restore and deduplicated by WTModel.state_hash, so the first
+win found is a shortest one. If the search runs out of new states before the
+depth bound, the level is proven unwinnable. Large layers can be expanded
+across worker processes; an optional beam width keeps only the most promising
+states per layer, trading the guarantees for speed.
+
+Exact search suits levels like level1 and level2 (well under a second and a
+few seconds). level3's eleven enemies put a shortest win around 30 turns deep,
+beyond exhaustive search; --beam 200 finds a 34-turn win in about 3 seconds.
+
+Usage:
+    python solver.py LEVEL [--depth 40] [--beam WIDTH] [-j WORKERS]
+"""
+import argparse
+import heapq
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import NamedTuple
+
+from a2 import ModelSnapshot, TranspositionTable, WTModel, load_file
+from headless import PLAYER_ACTIONS
+from support import *
+
+ACTIONS = tuple(PLAYER_ACTIONS) + (FIRE, WAIT)
+DEFAULT_DEPTH = 40
+DEFAULT_MAX_STATES = 1 << 22
+# Layers smaller than this are expanded in-process even when workers are set
+PARALLEL_MIN = 512
+
+# A child state: (action index, state hash, won, (enemies, -armour), snapshot)
+Child = tuple[int, int, bool, tuple[int, int], ModelSnapshot]
+
+
+class SolveResult(NamedTuple):
+    """Outcome of a search."""
+    level: str
+    commands: list[str] | None  # a shortest winning sequence, if one was found
+    depth: int  # deepest layer searched
+    states: int  # distinct states seen
+    exhausted: bool  # True if every reachable state was searched
+
+    def is_solved(self) -> bool:
+        return self.commands is not None
+
+    def __str__(self) -> str:
+        if self.commands is not None:
+            return (f"{self.level}: won in {len(self.commands)} turns "
+                    f"({self.states} states)\n" + "\n".join(self.commands))
+        if self.exhausted:
+            return f"{self.level}: cannot be won ({self.states} states)"
+        return f"{self.level}: no win within {self.depth} turns ({self.states} states)"
+
+
+def _expand(model: WTModel, snapshot: ModelSnapshot) -> list[Child]:
+    """Play every action from snapshot, returning the states the player survives."""
+    children = []
+    for index, command in enumerate(ACTIONS):
+        model.restore(snapshot)
+        before = model.state_hash()
+        if command in PLAYER_ACTIONS:
+            model.player_move(PLAYER_ACTIONS[command])
+        elif command == FIRE:
+            model.player_fire()
+        if command != WAIT and model.state_hash() == before:
+            continue  # Blocked move or fire at nothing: the same as waiting
+        if not model.is_game_over():
+            model.enemy_actions()
+        if model.has_lost():
+            continue
+        score = (len(model.get_enemies()), -model.get_player().get_armour())
+        children.append((index, model.state_hash(), model.has_won(), score, model.snapshot()))
+    return children
+
+
+_worker_model: WTModel | None = None
+
+
+def _init_worker(level: str):
+    global _worker_model
+    _worker_model = load_file(level)
+
+
+def _expand_chunk(snapshots: list[ModelSnapshot]) -> list[list[Child]]:
+    return [_expand(_worker_model, snapshot) for snapshot in snapshots]
+
+
+def _unwind(path) -> list[str]:
+    commands = []
+    while path is not None:
+        path, command = path
+        commands.append(command)
+    return commands[::-1]
+
+
+def solve(level: str,
+          max_depth: int = DEFAULT_DEPTH,
+          workers: int = 1,
+          beam: int | None = None,
+          max_states: int = DEFAULT_MAX_STATES) -> SolveResult:
+    """
+    Search for a shortest winning command sequence on a level.
+
+    Args:
+        level (str): Level file (text or binary save) to solve.
+        max_depth (int): Most turns to search.
+        workers (int): Processes used to expand large layers. 1 stays in
+                this process.
+        beam (int | None): If set, keep only this many states per layer,
+                preferring fewer enemies and more armour. Results are then
+                no longer guaranteed shortest, and never prove a level
+                unwinnable.
+        max_states (int): Size of the deduplication table. Beyond it the
+                oldest states are forgotten, which costs time but not
+                correctness.
+
+    Returns:
+        SolveResult: the winning commands, or None if there are none
+                within max_depth.
+    Raises:
+        ValueError: if the level file is invalid.
+        FileNotFoundError: if the level file does not exist.
+    """
+    model = load_file(level)
+    seen = TranspositionTable(max_states)
+    seen.add(model.state_hash())
+    if model.has_won():
+        return SolveResult(level, [], 0, len(seen), True)
+
+    # (snapshot, path) where path is a (parent path, command) chain
+    frontier = [(model.snapshot(), None)]
+    complete = True
+    pool = None
+    if workers > 1:
+        pool = ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(level,))
+    try:
+        for depth in range(1, max_depth + 1):
+            snapshots = [snapshot for snapshot, _ in frontier]
+            if pool is not None and len(snapshots) >= PARALLEL_MIN:
+                size = -(-len(snapshots) // (workers * 4))
+                chunks = [snapshots[i:i + size] for i in range(0, len(snapshots), size)]
+                expanded = [children for chunk in pool.map(_expand_chunk, chunks)
+                            for children in chunk]
+            else:
+                expanded = [_expand(model, snapshot) for snapshot in snapshots]
+
+            layer = []
+            for (_, path), children in zip(frontier, expanded):
+                for index, key, won, score, child in children:
+                    if not seen.add(key):
+                        continue
+                    child_path = (path, ACTIONS[index])
+                    if won:
+                        return SolveResult(level, _unwind(child_path), depth, len(seen), False)
+                    if depth + score[0] > max_depth:
+                        complete = False
+                        continue  # Each enemy needs its own turn to shoot
+                    layer.append((score, len(layer), child, child_path))
+
+            if not layer:
+                return SolveResult(level, None, depth, len(seen), complete)
+            if beam is not None and len(layer) > beam:
+                layer = heapq.nsmallest(beam, layer)
+                complete = False
+            frontier = [(child, path) for _, _, child, path in layer]
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    return SolveResult(level, None, max_depth, len(seen), False)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Find a shortest win for a We Tank! level.")
+    parser.add_argument("level", help="level file to solve")
+    parser.add_argument("--depth", type=int, default=DEFAULT_DEPTH, help="most turns to search")
+    parser.add_argument("--beam", type=int, default=None, help="states kept per layer")
+    parser.add_argument("-j", "--workers", type=int, default=1,
+                        help="worker processes (0 for one per core)")
+    args = parser.parse_args()
+
+    workers = args.workers or os.cpu_count() or 1
+    print(solve(args.level, args.depth, workers, args.beam))
+
+
+if __name__ == "__main__":
+    main()
@@ -40,6 +40,8 @@ HELP_MSG = """Commands:
  - `fire`: Fire!
  - `save F`: Save game to F
  - `load F`: Load game from F
+ - `undo`: Take back the last turn.
+ - `rewind N`: Take back the last N turns.
  - `help`: Print this help message.
  - `quit`: Exit Game."""
 
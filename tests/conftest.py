@@ -0,0 +1,26 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from levelgen import write_level  # noqa: E402
+
+LEVELS = [os.path.join(ROOT, "levels", f"level{n}.txt") for n in (1, 2, 3)]
+
+
+@pytest.fixture(params=LEVELS, ids=os.path.basename)
+def level(request) -> str:
+    """Each of the playable levels shipped in levels/."""
+    return request.param
+
+
+@pytest.fixture
+def large_level(tmp_path) -> str:
+    """A generated level big enough to load as a CompactBattlefield."""
+    path = str(tmp_path / "large.txt")
+    write_level(path, rows=120, cols=120, guards=20, patrols=20,
+                armour=10 ** 6, seed=1)
+    return path
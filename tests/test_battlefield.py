@@ -0,0 +1,173 @@
+"""Battlefield storage and the rock and tank indices built over it."""
+import os
+import random
+
+import pytest
+
+import a2
+from conftest import ROOT
+
+ACTIONS = ("forward", "back", "left", "right", "fire", "fire")
+
+
+def _turn(model: a2.WTModel, action: str):
+    if action == "fire":
+        model.player_fire()
+    else:
+        model.player_move(action)
+    if not model.is_game_over():
+        model.enemy_actions()
+
+
+def _actions(seed: int, turns: int = 40) -> list[str]:
+    rng = random.Random(seed)
+    return [rng.choice(ACTIONS) for _ in range(turns)]
+
+
+def _tile_ids(battlefield: a2.Battlefield) -> list[list[str]]:
+    return [[str(tile) for tile in row] for row in battlefield.get_tiles()]
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_compact_and_list_storage_agree(level, monkeypatch, seed):
+    listed = a2.load_model(level)
+    monkeypatch.setattr(a2.CompactBattlefield, "MIN_CELLS", 1)
+    compact = a2.load_model(level)
+    assert isinstance(compact.get_battlefield(), a2.CompactBattlefield)
+    assert not isinstance(listed.get_battlefield(), a2.CompactBattlefield)
+    for action in _actions(seed):
+        if listed.is_game_over():
+            break
+        _turn(listed, action)
+        _turn(compact, action)
+        assert str(compact) == str(listed)
+    assert _tile_ids(compact.get_battlefield()) == _tile_ids(listed.get_battlefield())
+    assert ({pos: str(rock) for pos, rock in compact.get_battlefield().get_rocks().items()}
+            == {pos: str(rock) for pos, rock in listed.get_battlefield().get_rocks().items()})
+
+
+def test_compact_rock_writes_destruction_back():
+    battlefield = a2.CompactBattlefield(["WR X", " RRW"])
+    rock = battlefield.get_tile((0, 1))
+    assert rock is battlefield.get_tile((0, 1))
+    assert battlefield.is_blocking((0, 1))
+    rock.destroy()
+    assert str(battlefield) == "WX X\n RRW"
+    assert not battlefield.is_blocking((0, 1))
+    assert battlefield.get_tile((0, 1)).is_destroyed()
+
+
+def test_make_tile_shares_immutable_tiles():
+    for tile_id in (a2.FLOOR_ID, a2.WALL_ID, a2.DESTROYED_ID):
+        assert a2.make_tile(tile_id) is a2.make_tile(tile_id)
+        assert str(a2.make_tile(tile_id)) == tile_id
+    rock = a2.make_tile(a2.ROCK_ID)
+    assert rock is not a2.make_tile(a2.ROCK_ID)
+    assert not hasattr(rock, "__dict__")
+    with pytest.raises(ValueError, match=a2.INVALID_TILE_MSG):
+        a2.make_tile("Q")
+
+
+def _scan_rocks(battlefield: a2.Battlefield) -> tuple[set, set]:
+    rocks, live = set(), set()
+    for r, row in enumerate(battlefield.get_tiles()):
+        for c, tile in enumerate(row):
+            if isinstance(tile, a2.Rock):
+                rocks.add((r, c))
+                if not tile.is_destroyed():
+                    live.add((r, c))
+    return rocks, live
+
+
+@pytest.mark.parametrize("compact", [False, True], ids=["list", "compact"])
+def test_rock_indices_match_grid(level, monkeypatch, compact):
+    if compact:
+        monkeypatch.setattr(a2.CompactBattlefield, "MIN_CELLS", 1)
+    model = a2.load_model(level)
+    battlefield = model.get_battlefield()
+    for action in _actions(seed=0):
+        if model.is_game_over():
+            break
+        _turn(model, action)
+        rocks, live = _scan_rocks(battlefield)
+        assert set(battlefield.get_rocks()) == rocks
+        assert set(battlefield.get_live_rocks()) == live
+    # Rocks destroyed directly rather than through destroy_rock
+    for rock in battlefield.get_live_rocks().values():
+        rock.destroy()
+    assert battlefield.get_live_rocks() == {}
+    assert set(battlefield.get_rocks()) == _scan_rocks(battlefield)[0]
+
+
+def _scan_tanks(model: a2.WTModel) -> dict:
+    positions = {}
+    for tank in [model.get_player()] + model.get_enemies():
+        positions[tank.get_position()] = tank
+    return positions
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_occupancy_matches_tanks(level, seed):
+    model = a2.load_model(level)
+    for action in _actions(seed):
+        if model.is_game_over():
+            break
+        _turn(model, action)
+        positions = _scan_tanks(model)
+        assert model.tank_positions() == positions
+        for pos, tank in positions.items():
+            assert model.tank_at(pos) is tank
+
+
+def test_shared_tanks_update_every_model(level):
+    first = a2.load_model(level)
+    second = a2.WTModel(first.get_battlefield(), first.get_player(), first.get_enemies())
+    for _ in range(3):
+        first.enemy_actions()
+    assert second.tank_positions() == _scan_tanks(second) == first.tank_positions()
+
+
+@pytest.mark.parametrize("compact", [False, True], ids=["list", "compact"])
+def test_sight_tables_match_marching(level, monkeypatch, compact):
+    if compact:
+        monkeypatch.setattr(a2.CompactBattlefield, "MIN_CELLS", 1)
+    model = a2.load_model(level)
+    battlefield = model.get_battlefield()
+    for action in _actions(seed=1):
+        if model.is_game_over():
+            break
+        _turn(model, action)
+        for r, row in enumerate(battlefield.get_tiles()):
+            for c in range(len(row)):
+                for heading in battlefield._HEADINGS:
+                    assert (battlefield.visible_distance((r, c), heading)
+                            == battlefield._march((r, c), heading))
+
+
+@pytest.mark.parametrize("battlefield_class", [a2.Battlefield, a2.CompactBattlefield])
+def test_direct_destroy_reopens_sight(battlefield_class):
+    tiles = ["W R  "] if battlefield_class is a2.CompactBattlefield else [
+        [a2.make_tile(tile_id) for tile_id in "W R  "]]
+    battlefield = battlefield_class(tiles)
+    assert battlefield.visible_distance((0, 0), (0, 1)) == 2
+    battlefield.get_tile((0, 2)).destroy()
+    assert battlefield.visible_distance((0, 0), (0, 1)) == 4
+
+
+def test_battlefields_sharing_rocks_both_update():
+    tiles = [[a2.make_tile(tile_id) for tile_id in "W R  "]]
+    first, second = a2.Battlefield(tiles), a2.Battlefield(tiles)
+    assert first.visible_distance((0, 0), (0, 1)) == 2
+    assert second.visible_distance((0, 0), (0, 1)) == 2
+    first.destroy_rock((0, 2))
+    for battlefield in (first, second):
+        assert battlefield.get_live_rocks() == {}
+        assert battlefield.visible_distance((0, 0), (0, 1)) == 4
+
+
+def test_compact_sight_does_not_materialise_tiles(monkeypatch):
+    monkeypatch.setattr(a2.CompactBattlefield, "MIN_CELLS", 1)
+    model = a2.load_model(os.path.join(ROOT, "levels", "level1.txt"))
+    for _ in range(5):
+        model.enemy_actions()
+    assert model.get_battlefield()._tiles is None
@@ -0,0 +1,49 @@
+"""Command dispatch through the WTController registry."""
+import pytest
+
+import a2
+import headless
+from conftest import LEVELS
+from display import MemorySink
+
+
+def _controller() -> a2.WTController:
+    return a2.WTController(a2.load_model(LEVELS[0]), sink=MemorySink())
+
+
+def test_registered_commands_are_parsed_and_dispatched():
+    controller = _controller()
+    calls = []
+    controller.register_command("stats", lambda: calls.append("stats") or True)
+    controller.register_prefix_command("say", lambda text: calls.append(text) or True,
+                                       lambda text: text.isalpha())
+    assert a2.parse_command("stats") is None
+    assert controller.parse_command("STATS") == "stats"
+    assert controller.parse_command("say 123") is None
+    controller.play_script(["stats", "say hello", "say 123", "wait"])
+    assert calls == ["stats", "hello"]
+    assert controller.get_turns() == 1
+
+
+def test_registering_replaces_a_default():
+    controller = _controller()
+    controller.register_command(a2.QUIT, lambda: True)
+    controller.play_script(["quit", "wait"])
+    assert controller.get_turns() == 1
+
+
+def test_unknown_and_incomplete_commands():
+    controller = _controller()
+    assert controller.parse_command("save ") is None
+    assert controller.parse_command("load") is None
+    with pytest.raises(ValueError):
+        controller.handle_command("dance")
+
+
+def test_undo_takes_turns_back():
+    controller = _controller()
+    controller.play_script(["wait", "fire", "turn left", "undo", "rewind 5"])
+    assert controller.get_turns() == 0
+    assert str(controller) == str(a2.load_model(LEVELS[0]))
+    result = headless.run_game(LEVELS[0], ["wait", "fire", "undo", "wait"])
+    assert result.turns == 2
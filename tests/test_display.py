@@ -0,0 +1,74 @@
+"""Views must print every frame exactly as a freshly built WTView would."""
+import random
+
+import pytest
+
+import a2
+from conftest import LEVELS
+from display import (BaseDisplay, FramebufferView, HSplitDisplay, VSplitDisplay,
+                     WTView)
+
+ACTIONS = ("forward", "back", "left", "right", "fire", "fire")
+
+
+def _states(level: str, seed: int, turns: int = 30):
+    """Yield the model after each turn of a randomly played game."""
+    rng = random.Random(seed)
+    model = a2.load_model(level)
+    yield model
+    for _ in range(turns):
+        if model.is_game_over():
+            return
+        action = rng.choice(ACTIONS)
+        if action == "fire":
+            model.player_fire()
+        else:
+            model.player_move(action)
+        if not model.is_game_over():
+            model.enemy_actions()
+        yield model
+
+
+def _draw(view, model: a2.WTModel, capsys) -> str:
+    view.draw_game(model.get_battlefield().get_tiles(),
+                   model.get_player(), model.get_enemies())
+    return capsys.readouterr().out
+
+
+@pytest.mark.parametrize("view_class", [WTView, FramebufferView])
+@pytest.mark.parametrize("seed", range(3))
+def test_view_matches_fresh_wtview(capsys, view_class, seed):
+    view = view_class()
+    # Every level in turn, so the grid is also rebuilt when its size changes
+    for level in LEVELS + LEVELS[:1]:
+        for model in _states(level, seed):
+            assert _draw(view, model, capsys) == _draw(WTView(), model, capsys)
+
+
+def test_layout_cache_follows_changes():
+    root = VSplitDisplay(None)
+    row = HSplitDisplay(root)
+    root.append(row)
+    first = BaseDisplay(row, ["ab"])
+    row.append(first)
+    row.append(BaseDisplay(row, ["c"]))
+    footer = BaseDisplay(root, ["x"])
+    root.append(footer)
+
+    def size():
+        lines = root.render()
+        assert len(lines) == root.get_height()
+        assert {len(line) for line in lines} == {root.get_width()}
+        return root.get_width(), root.get_height()
+
+    assert size() == (3, 2)
+    first.set_content(["abcdef", "g"])
+    assert size() == (7, 3)
+    row[1].set_width(5)
+    assert size() == (11, 3)
+    row.pop(0)
+    assert size() == (5, 2)
+    footer.set_height(3)
+    assert size() == (5, 4)
+    root.insert(0, BaseDisplay(root, ["a much longer line"]))
+    assert size() == (18, 5)
@@ -0,0 +1,63 @@
+"""Scripted games played by the headless runner."""
+import os
+import re
+
+import a2
+import headless
+from conftest import LEVELS, ROOT
+
+
+def _transcript_commands(name: str) -> list[str]:
+    """The commands typed in one of the recorded gameplay transcripts."""
+    with open(os.path.join(ROOT, "gameplay", name), encoding="utf-8") as fh:
+        return re.findall(re.escape(a2.COMMAND_PROMPT) + "(.*)", fh.read())
+
+
+def test_plays_recorded_games():
+    won = headless.run_game(LEVELS[1], _transcript_commands("win_level2.txt"))
+    assert (won.outcome, won.turns) == (headless.WON, 31)
+    lost = headless.run_game(LEVELS[1], _transcript_commands("lose_level2.txt"))
+    assert (lost.outcome, lost.turns) == (headless.LOST, 2)
+
+
+def test_matches_model_played_directly(level):
+    commands = ["turn left", "fire", "nonsense", "help", "move forward", "wait", "fire"]
+    model = a2.load_model(level)
+    for action in ("left", "fire", "forward", "wait", "fire"):
+        if model.is_game_over():
+            break
+        if action == "fire":
+            model.player_fire()
+        elif action != "wait":
+            model.player_move(action)
+        if not model.is_game_over():
+            model.enemy_actions()
+    result = headless.run_game(level, commands)
+    assert result.final_state == str(model)
+
+
+def test_quit_and_unfinished_games():
+    quit_early = headless.run_game(LEVELS[0], ["wait", "quit", "fire"])
+    assert (quit_early.outcome, quit_early.turns) == (headless.QUIT_EARLY, 1)
+    assert quit_early.final_state == headless.run_game(LEVELS[0], ["wait"]).final_state
+    unfinished = headless.run_game(LEVELS[0], ["wait"] * 5)
+    assert (unfinished.outcome, unfinished.turns) == (headless.UNFINISHED, 5)
+
+
+def test_batch_results_do_not_depend_on_workers():
+    jobs = [(level, _transcript_commands(name))
+            for level in LEVELS for name in ("win_level2.txt", "lose_level2.txt")]
+    serial = headless.run_batch(jobs, workers=1)
+    parallel = headless.run_batch(jobs, workers=2)
+    assert parallel.get_results() == serial.get_results()
+    assert [result.level for result in serial.get_results()] == [level for level, _ in jobs]
+    assert sum(serial.outcomes().values()) == len(jobs)
+    assert serial.outcomes()[headless.WON] >= 1
+
+
+def test_ragged_binary_save_is_skipped(tmp_path):
+    level = tmp_path / "ragged.txt"
+    level.write_text("WWWW\nW  W\nW W\nWWWW\n\nP,1,1,0,1,0,2\nG,1,2,0,-1,0\n")
+    result = headless.run_game(str(level), ["save " + str(tmp_path / "x.wtb"), "wait"])
+    assert result.turns == 1
+    assert not (tmp_path / "x.wtb").exists()
@@ -0,0 +1,83 @@
+"""LevelCache hits, eviction and invalidation."""
+import os
+import shutil
+
+import a2
+from conftest import LEVELS
+from levelcache import LevelCache, LevelTemplate
+
+
+def _copy_levels(tmp_path) -> list[str]:
+    copies = []
+    for level in LEVELS:
+        copies.append(str(tmp_path / os.path.basename(level)))
+        shutil.copy(level, copies[-1])
+    return copies
+
+
+def test_hits_return_fresh_independent_models(level):
+    cache = LevelCache()
+    first = cache.load(level)
+    first.player_fire()
+    first.enemy_actions()
+    second = cache.load(level)
+    assert (cache.get_hits(), cache.get_misses()) == (1, 1)
+    assert second is not first
+    assert str(second) == str(a2.load_model(level))
+    assert str(cache.load(level)) == str(second)
+
+
+def test_compact_levels_round_trip(large_level):
+    cache = LevelCache()
+    cache.load(large_level)
+    model = cache.load(large_level)
+    assert cache.get_hits() == 1
+    assert isinstance(model.get_battlefield(), a2.CompactBattlefield)
+    assert str(model) == str(a2.load_model(large_level))
+
+
+def test_evicts_least_recently_used(tmp_path):
+    first, second, third = _copy_levels(tmp_path)
+    cache = LevelCache(max_entries=2)
+    cache.load(first)
+    cache.load(second)
+    cache.load(first)   # first is now the most recently used
+    cache.load(third)   # evicts second
+    assert len(cache) == 2
+    misses = cache.get_misses()
+    cache.load(first)
+    cache.load(third)
+    assert cache.get_misses() == misses
+    cache.load(second)
+    assert cache.get_misses() == misses + 1
+
+
+def test_memory_cap(tmp_path):
+    first, second, _ = _copy_levels(tmp_path)
+    sizes = [LevelTemplate(a2.load_model(level)).size() for level in (first, second)]
+    cache = LevelCache(max_bytes=max(sizes))
+    cache.load(first)
+    cache.load(second)
+    assert len(cache) == 1
+    assert cache.get_size() == sizes[1]
+
+    too_small = LevelCache(max_bytes=min(sizes) - 1)
+    assert str(too_small.load(first)) == str(a2.load_model(first))
+    assert len(too_small) == 0 and too_small.get_size() == 0
+
+
+def test_changed_file_is_reparsed(tmp_path):
+    level = _copy_levels(tmp_path)[0]
+    cache = LevelCache()
+    original = str(cache.load(level))
+    with open(LEVELS[1], encoding="utf-8") as fh:
+        replacement = fh.read()
+    with open(level, "w", encoding="utf-8") as fh:
+        fh.write(replacement)
+    stat = os.stat(level)
+    os.utime(level, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    reloaded = cache.load(level)
+    assert cache.get_misses() == 2
+    assert str(reloaded) != original
+    assert str(reloaded) == str(a2.load_model(LEVELS[1]))
+    assert len(cache) == 1
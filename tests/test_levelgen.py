@@ -0,0 +1,33 @@
+"""Generated levels are reproducible and load like hand-written ones."""
+import pytest
+
+import a2
+from levelgen import generate_level
+
+
+def test_same_arguments_give_same_level():
+    assert generate_level(30, 40, guards=3, seed=7) == generate_level(30, 40, guards=3, seed=7)
+    assert generate_level(30, 40, guards=3, seed=7) != generate_level(30, 40, guards=3, seed=8)
+
+
+def test_generated_level_loads(large_level):
+    model = a2.load_model(large_level)
+    tiles = model.get_battlefield().get_tiles()
+    assert (len(tiles), len(tiles[0])) == (120, 120)
+    assert all(str(tile) == a2.WALL_ID for tile in tiles[0] + tiles[-1])
+    assert all(str(row[0]) == str(row[-1]) == a2.WALL_ID for row in tiles)
+    kinds = [str(enemy).split(",")[0] for enemy in model.get_enemies()]
+    assert (kinds.count(a2.GUARD_ID), kinds.count(a2.PATROL_ID)) == (20, 20)
+    assert model.get_player().get_armour() == 10 ** 6
+    assert isinstance(model.get_battlefield(), a2.CompactBattlefield)
+
+
+@pytest.mark.parametrize("kwargs", [
+    {"rows": 2, "cols": 10},
+    {"rows": 10, "cols": 1001},
+    {"rows": 10, "cols": 10, "wall_density": 0.5, "rock_density": 0.5},
+    {"rows": 3, "cols": 3, "guards": 1},
+])
+def test_rejects_impossible_levels(kwargs):
+    with pytest.raises(ValueError):
+        generate_level(**kwargs)
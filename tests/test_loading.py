@@ -0,0 +1,132 @@
+"""Level loading edge cases and the binary save format."""
+import os
+
+import pytest
+
+import a2
+from conftest import ROOT
+from display import MemorySink
+from support import (FILE_NOT_FOUND_MSG, INVALID_ENEMY_MSG, INVALID_PLAYER_MSG,
+                     INVALID_TILE_MSG)
+
+
+RAGGED = "WWWW\nW  W\nW W\nWWWW\n\nP,1,1,0,1,0,2\nG,1,2,0,-1,0\n"
+
+
+def _write(tmp_path, name: str, text: str) -> str:
+    path = tmp_path / name
+    with open(path, "w", encoding="utf-8", newline="") as fh:
+        fh.write(text)
+    return str(path)
+
+
+def _play(model: a2.WTModel, turns: int = 8):
+    """Fire and turn for a few turns, so rocks break and tanks move."""
+    for turn in range(turns):
+        if model.is_game_over():
+            break
+        model.player_fire() if turn % 3 else model.player_move("left")
+        if not model.is_game_over():
+            model.enemy_actions()
+
+
+@pytest.mark.parametrize("variant", [
+    lambda text: text.replace("\n", "\r\n"),
+    lambda text: text + "\n\n\n",
+    lambda text: text.rstrip("\n"),
+], ids=["crlf", "trailing-blank-lines", "no-final-newline"])
+def test_line_ending_variants_load_the_same(tmp_path, level, variant):
+    with open(level, encoding="utf-8") as fh:
+        text = fh.read()
+    path = _write(tmp_path, "variant.txt", variant(text))
+    assert str(a2.load_model(path)) == str(a2.load_model(level))
+
+
+@pytest.mark.parametrize("name, message", [
+    ("level_invalid_tiles_id1.txt", INVALID_TILE_MSG),
+    ("level_invalid_tiles_id2.txt", INVALID_TILE_MSG),
+    ("level_invalid_player1.txt", INVALID_PLAYER_MSG),
+    ("level_invalid_player2.txt", INVALID_PLAYER_MSG),
+    ("level_invalid_enemies1.txt", INVALID_ENEMY_MSG),
+    ("level_invalid_enemies2.txt", INVALID_ENEMY_MSG),
+])
+def test_invalid_levels_raise(name, message):
+    with pytest.raises(ValueError, match=message):
+        a2.load_model(os.path.join(ROOT, "levels", name))
+
+
+@pytest.mark.parametrize("text", ["", "WWW\nW W\nWWW\n"], ids=["empty", "grid-only"])
+def test_missing_sections_raise(tmp_path, text):
+    with pytest.raises(ValueError):
+        a2.load_model(_write(tmp_path, "partial.txt", text))
+
+
+def test_missing_file_raises():
+    with pytest.raises(FileNotFoundError):
+        a2.load_model(os.path.join(ROOT, "levels", "no_such_level.txt"))
+
+
+def test_controller_reports_missing_file(level):
+    controller = a2.WTController(a2.load_model(level))
+    with pytest.raises(ValueError, match=FILE_NOT_FOUND_MSG):
+        controller.load_game(os.path.join(ROOT, "levels", "no_such_level.txt"))
+
+
+def test_large_level_loads_compact(large_level):
+    assert isinstance(a2.load_model(large_level).get_battlefield(), a2.CompactBattlefield)
+
+
+@pytest.mark.parametrize("extension", [a2.BINARY_SAVE_EXTENSION, ".txt"])
+def test_save_file_round_trip(tmp_path, level, extension):
+    model = a2.load_model(level)
+    _play(model)
+    path = str(tmp_path / ("save" + extension))
+    a2.save_file(model, path)
+    loaded = a2.load_binary_model(path) if a2.is_binary_save(path) else a2.load_model(path)
+    assert str(loaded) == str(model)
+
+
+def test_binary_round_trip_large_level(tmp_path, large_level):
+    model = a2.load_model(large_level)
+    _play(model)
+    path = str(tmp_path / ("large" + a2.BINARY_SAVE_EXTENSION))
+    a2.save_binary_model(model, path)
+    assert a2.is_binary_save(path)
+    assert str(a2.load_binary_model(path)) == str(model)
+
+
+@pytest.mark.parametrize("damage", [
+    lambda data: data[:3],                      # truncated header
+    lambda data: b"NOPE" + data[4:],            # wrong magic
+    lambda data: data[:len(data) - 5],          # truncated last tank
+    lambda data: data[:20] + b"Q" + data[21:],  # unknown tile id
+])
+def test_damaged_binary_save_raises(tmp_path, level, damage):
+    path = str(tmp_path / ("save" + a2.BINARY_SAVE_EXTENSION))
+    a2.save_binary_model(a2.load_model(level), path)
+    with open(path, "rb") as fh:
+        data = fh.read()
+    with open(path, "wb") as fh:
+        fh.write(damage(data))
+    with pytest.raises(ValueError):
+        a2.load_binary_model(path)
+
+
+def test_ragged_battlefield_has_no_binary_save(tmp_path):
+    model = a2.load_model(_write(tmp_path, "ragged.txt", RAGGED))
+    with pytest.raises(ValueError, match=a2.RAGGED_SAVE_MSG):
+        a2.save_file(model, str(tmp_path / ("ragged" + a2.BINARY_SAVE_EXTENSION)))
+    a2.save_file(model, str(tmp_path / "ragged_copy.txt"))
+    assert str(a2.load_model(str(tmp_path / "ragged_copy.txt"))) == str(model)
+
+
+def test_controller_reports_ragged_binary_save(tmp_path, monkeypatch):
+    controller = a2.WTController(a2.load_model(_write(tmp_path, "ragged.txt", RAGGED)),
+                                 sink=MemorySink())
+    commands = iter(["save " + str(tmp_path / "x.wtb"), "quit"])
+    monkeypatch.setattr("builtins.input", lambda: next(commands))
+    controller.play()
+    output = controller.get_sink().getvalue()
+    assert a2.RAGGED_SAVE_MSG in output
+    assert a2.SAVE_MSG not in output
+    assert not (tmp_path / "x.wtb").exists()
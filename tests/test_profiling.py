@@ -0,0 +1,51 @@
+"""Installing and removing the per-phase Profiler."""
+import io
+import json
+
+import a2
+import profiling
+from conftest import LEVELS
+from display import WTView
+
+WRAPPED = ([(a2.WTController, name) for name in profiling.CONTROLLER_PHASES]
+           + [(a2.WTModel, name) for name in profiling.MODEL_METHODS]
+           + [(WTView, profiling.VIEW_PHASE)])
+
+
+def _methods() -> dict:
+    return {(owner, name): owner.__dict__.get(name) for owner, name in WRAPPED}
+
+
+def test_install_and_uninstall_restore_methods():
+    before = _methods()
+    profiler = profiling.Profiler()
+    profiler.install()
+    assert all(_methods()[key] is not before[key] for key in before)
+    profiler.install()  # a second install is a no-op
+    profiler.uninstall()
+    assert _methods() == before
+
+
+def test_records_one_line_per_turn(monkeypatch, capsys):
+    sink = io.StringIO()
+    commands = iter(["wait", "fire", "quit"])
+    monkeypatch.setattr("builtins.input", lambda: next(commands))
+    with profiling.Profiler(sink) as profiler:
+        a2.WTController(a2.load_model(LEVELS[0])).play()
+    records = [json.loads(line) for line in sink.getvalue().splitlines()]
+    assert records == profiler.get_records()
+    assert [record["turn"] for record in records] == list(range(len(records)))
+    phases = set().union(*(record["phases"] for record in records))
+    assert {"get_command", "enemy_actions", "player_fire", "draw_game"} <= phases
+    assert set(profiler.percentiles()) == set(profiling.PERCENTILES)
+
+
+def test_from_env_owns_its_file(tmp_path):
+    assert profiling.from_env({}) is None
+    path = tmp_path / "turns.jsonl"
+    profiler = profiling.from_env({profiling.ENV_VAR: str(path)})
+    sink = profiler._sink
+    with profiler:
+        a2.load_model(LEVELS[0]).enemy_actions()
+    assert sink.closed
+    assert json.loads(path.read_text())["phases"]["enemy_actions"]["calls"] == 1
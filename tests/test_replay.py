@@ -0,0 +1,18 @@
+"""The recorded gameplay sessions replay as expected."""
+import glob
+import os
+
+import pytest
+
+from benchmarks import replay
+from conftest import ROOT
+
+TRANSCRIPTS = sorted(glob.glob(os.path.join(ROOT, "gameplay", "*.txt")))
+
+
+@pytest.mark.parametrize("transcript", TRANSCRIPTS, ids=os.path.basename)
+def test_transcript_replays(transcript):
+    result = replay.benchmark(transcript, repeat=1)
+    assert result["level"] is not None
+    known = replay.KNOWN_DIVERGENCES.get(os.path.basename(transcript))
+    assert result["difference"] == known
@@ -0,0 +1,52 @@
+"""Scripted play through WTController.play_script."""
+import io
+
+import a2
+from conftest import LEVELS
+from display import MemorySink, OutputSink
+from test_headless import _transcript_commands
+from test_sinks import CountingStream
+
+FRAME_TOP = "-" * 80 + "\n" + " " * 36 + "We Tank!"
+
+
+def _scripted(commands, show_frames: bool = True, level: str = LEVELS[0]) -> str:
+    controller = a2.WTController(a2.load_model(level), sink=MemorySink())
+    controller.play_script(commands, show_frames)
+    return controller.get_sink().getvalue()
+
+
+def test_matches_interactive_play(monkeypatch):
+    commands = _transcript_commands("win_level2.txt")
+    pending = iter(commands)
+    monkeypatch.setattr("builtins.input", lambda: next(pending))
+    controller = a2.WTController(a2.load_model(LEVELS[1]), sink=MemorySink())
+    controller.play()
+    interactive = controller.get_sink().getvalue().replace(a2.COMMAND_PROMPT, "")
+    assert _scripted(commands, level=LEVELS[1]) == interactive
+    assert interactive.endswith(a2.WIN_MSG + "\n")
+
+
+def test_accepts_files_and_generators():
+    commands = ["turn left", "fire", "bogus", "wait"]
+    expected = _scripted(commands)
+    assert a2.INVALID_COMMAND_MSG in expected
+    assert _scripted(io.StringIO("".join(command + "\r\n" for command in commands))) == expected
+    assert _scripted(command for command in commands) == expected
+
+
+def test_final_only_draws_the_last_frame():
+    commands = ["turn left", "fire", "help", "wait", "fire"]
+    full = _scripted(commands)
+    final = _scripted(commands, show_frames=False)
+    assert final.count(FRAME_TOP) == 1
+    assert a2.HELP_MSG in final
+    assert full[full.rindex(FRAME_TOP):] == final[final.rindex(FRAME_TOP):]
+
+
+def test_stops_at_quit_and_flushes_once():
+    stream = CountingStream()
+    controller = a2.WTController(a2.load_model(LEVELS[0]), sink=OutputSink(stream))
+    controller.play_script(["wait", "quit", "fire"])
+    assert stream.writes == 1
+    assert stream.getvalue() == _scripted(["wait"])
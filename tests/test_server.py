@@ -0,0 +1,52 @@
+"""Sessions of the TCP game server over loopback."""
+import asyncio
+
+from a2 import RAGGED_SAVE_MSG, WTController, load_file
+from display import MemorySink
+from server import (FILE_ACCESS_MSG, INVALID_FILE_NAME_MSG, GameServer,
+                    play_remote)
+from support import COMMAND_PROMPT, LOAD_MSG, SAVE_MSG
+
+
+def _session(level: str, root: str, commands: list[str]) -> str:
+    async def run():
+        server = await GameServer(level, root).start(port=0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            return await play_remote("127.0.0.1", port, commands)
+    return asyncio.run(run())
+
+
+def test_session_matches_local_play(level, tmp_path, monkeypatch):
+    commands = ["move forward", "fire", "help", "bogus", "undo", "quit"]
+    pending = iter(commands)
+    monkeypatch.setattr("builtins.input", lambda: next(pending))
+    controller = WTController(load_file(level), sink=MemorySink())
+    controller.play()
+    remote = _session(level, str(tmp_path), commands)
+    # Local play is the same session without the echoed commands
+    for command in commands:
+        remote = remote.replace(COMMAND_PROMPT + command + "\n", COMMAND_PROMPT, 1)
+    assert remote == controller.get_sink().getvalue()
+
+
+def test_file_names_are_confined(level, tmp_path):
+    (tmp_path / "folder").mkdir()
+    transcript = _session(level, str(tmp_path), [
+        "save .", "load ..", "save ../escape.txt", "load folder",
+        "save kept.txt", "load kept.txt", "quit",
+    ])
+    assert transcript.count(INVALID_FILE_NAME_MSG) == 3
+    assert transcript.count(FILE_ACCESS_MSG) == 1
+    assert SAVE_MSG in transcript and LOAD_MSG in transcript
+    assert (tmp_path / "kept.txt").exists()
+    assert not (tmp_path.parent / "escape.txt").exists()
+
+
+def test_ragged_binary_save_keeps_session(tmp_path):
+    level = tmp_path / "ragged.txt"
+    level.write_text("WWWW\nW  W\nW W\nWWWW\n\nP,1,1,0,1,0,2\nG,1,2,0,-1,0\n")
+    transcript = _session(str(level), str(tmp_path), ["save x.wtb", "save x.txt", "quit"])
+    assert RAGGED_SAVE_MSG in transcript
+    assert transcript.count(SAVE_MSG) == 1
+    assert (tmp_path / "x.txt").exists() and not (tmp_path / "x.wtb").exists()
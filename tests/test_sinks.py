@@ -0,0 +1,59 @@
+"""Buffered output: one write per prompt, and standalone views still print."""
+import io
+
+import pytest
+
+import a2
+import display
+from conftest import LEVELS
+
+
+class CountingStream(io.StringIO):
+    """StringIO that counts its write calls."""
+
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+
+    def write(self, text: str) -> int:
+        self.writes += 1
+        return super().write(text)
+
+
+def _draw(view, model: a2.WTModel):
+    view.draw_game(model.get_battlefield().get_tiles(), model.get_player(), model.get_enemies())
+
+
+def test_controller_writes_once_per_prompt(monkeypatch):
+    commands = iter(["fire", "help", "bogus", "turn left", "quit"])
+    monkeypatch.setattr("builtins.input", lambda: next(commands))
+    stream = CountingStream()
+    controller = a2.WTController(a2.load_model(LEVELS[0]), sink=display.OutputSink(stream))
+    controller.play()
+    prompts = stream.getvalue().count(a2.COMMAND_PROMPT)
+    assert prompts == 5
+    assert stream.writes == prompts
+
+
+@pytest.mark.parametrize("view_class", [display.WTView, display.FramebufferView])
+def test_standalone_views_flush_each_frame(capsys, view_class):
+    model = a2.load_model(LEVELS[0])
+    view = view_class()
+    _draw(view, model)
+    assert capsys.readouterr().out.count(a2.WALL_ID) > 0
+
+    sink = display.MemorySink()
+    view.set_sink(sink)
+    _draw(view, model)
+    assert capsys.readouterr().out == ""
+    assert sink.getvalue().count(a2.WALL_ID) > 0
+
+
+def test_memory_sink_take():
+    sink = display.MemorySink()
+    sink.write("one\n")
+    sink.flush()
+    sink.write("two\n")
+    assert sink.take() == "one\ntwo\n"
+    assert sink.getvalue() == ""
+    assert not sink.isatty()
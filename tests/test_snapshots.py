@@ -0,0 +1,180 @@
+"""Snapshots, undo history and the incremental state hash."""
+import pickle
+import random
+from collections import Counter
+
+import pytest
+
+import a2
+from conftest import LEVELS
+from support import DESTROYED_ID
+
+ACTIONS = ("fire", "fire", "forward", "back", "left", "right")
+
+
+def _take_turn(model: a2.WTModel, action: str):
+    if action == "fire":
+        model.player_fire()
+    else:
+        model.player_move(action)
+    if not model.is_game_over():
+        model.enemy_actions()
+
+
+def _hash_from_scratch(model: a2.WTModel) -> int:
+    """The state hash recomputed from the tanks and rocks as they are now."""
+    result = 0
+    tanks = [model.get_player()] + model.get_enemies()
+    for key, count in Counter(tank.state_key() for tank in tanks).items():
+        for n in range(count):
+            result ^= key if n == 0 else a2.zobrist_key(key, n)
+    for pos in model.get_battlefield().destroyed_rocks():
+        result ^= a2.zobrist_key(ord(DESTROYED_ID), pos)
+    return result
+
+
+def _assert_sight_lines_current(model: a2.WTModel):
+    battlefield = model.get_battlefield()
+    for tank in [model.get_player()] + model.get_enemies():
+        pos = tank.get_position()
+        for heading in battlefield._HEADINGS:
+            assert battlefield.visible_distance(pos, heading) == battlefield._march(pos, heading)
+
+
+def _random_restores(path: str, seed: int, turns: int = 150):
+    rng = random.Random(seed)
+    model = a2.load_model(path)
+    history = []  # (snapshot, str, hash) before each turn
+    for _ in range(turns):
+        if model.is_game_over():
+            break
+        history.append((model.snapshot(), str(model), model.state_hash()))
+        _take_turn(model, rng.choice(ACTIONS))
+        assert model.state_hash() == _hash_from_scratch(model)
+        if rng.random() < 0.2:
+            index = rng.randrange(len(history))
+            snapshot, text, key = history[index]
+            model.restore(snapshot)
+            assert str(model) == text
+            assert model.state_hash() == key == _hash_from_scratch(model)
+            del history[index + 1:]
+    # Out-of-order restores
+    for _ in range(30):
+        snapshot, text, key = rng.choice(history)
+        model.restore(snapshot)
+        assert str(model) == text
+        assert model.state_hash() == key
+    _assert_sight_lines_current(model)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_restore_returns_to_snapshot(level, seed):
+    _random_restores(level, seed)
+
+
+def test_restore_on_large_level(large_level):
+    _random_restores(large_level, seed=0, turns=60)
+
+
+def test_equal_states_hash_equally(level):
+    first, second = a2.load_model(level), a2.load_model(level)
+    start = first.state_hash()
+    assert second.state_hash() == start
+    for action in ("fire", "left", "fire"):
+        _take_turn(first, action)
+        _take_turn(second, action)
+    assert first.state_hash() == second.state_hash() == _hash_from_scratch(first)
+    assert first.state_hash() != start
+
+
+def test_pickled_snapshot_restores_into_fresh_model(level):
+    model = a2.load_model(level)
+    for action in ("fire", "left", "fire", "forward"):
+        _take_turn(model, action)
+    snapshot = pickle.loads(pickle.dumps(model.snapshot()))
+    fresh = a2.load_model(level)
+    fresh.restore(snapshot)
+    assert str(fresh) == str(model)
+    assert fresh.state_hash() == model.state_hash()
+
+
+def test_snapshot_from_other_model_is_rejected(level):
+    with pytest.raises(ValueError):
+        a2.load_model(level).restore(a2.load_model(level).snapshot())
+
+
+@pytest.mark.parametrize("compact", [False, True], ids=["list", "compact"])
+def test_direct_rock_destroy_and_repair(compact):
+    row = "W R  "
+    if compact:
+        battlefield = a2.CompactBattlefield([row])
+    else:
+        battlefield = a2.Battlefield([[a2.make_tile(ch) for ch in row]])
+    battlefield.get_tile((0, 2)).destroy()
+    assert battlefield.visible_distance((0, 0), (0, 1)) == 4
+    assert battlefield.destroyed_rocks() == ((0, 2),)
+    assert battlefield.get_live_rocks() == {}
+    assert battlefield.rock_hash() == a2.zobrist_key(ord(DESTROYED_ID), (0, 2))
+
+    battlefield.get_rocks()[(0, 2)].repair()
+    assert battlefield.visible_distance((0, 0), (0, 1)) == 2
+    assert battlefield.destroyed_rocks() == ()
+    assert set(battlefield.get_live_rocks()) == {(0, 2)}
+    assert battlefield.rock_hash() == 0
+
+
+def test_identical_enemies_do_not_cancel():
+    battlefield = a2.Battlefield([[a2.make_tile(ch) for ch in "     "]])
+
+    def model(*enemies):
+        player = a2.Player((0, 0), (0, 1), 0, 3)
+        return a2.WTModel(battlefield, player, [a2.Guard(*enemy) for enemy in enemies])
+
+    guard = ((0, 3), (0, 1), 0)
+    assert len({model().state_hash(), model(guard).state_hash(),
+                model(guard, guard).state_hash()}) == 3
+
+    pair = model(guard, guard)
+    enemy = pair.get_enemies()[1]
+    enemy.set_position((0, 4))
+    assert pair.state_hash() == model(guard, ((0, 4), (0, 1), 0)).state_hash()
+    enemy.set_position((0, 3))
+    assert pair.state_hash() == model(guard, guard).state_hash()
+
+
+def test_shared_tanks_update_every_hash(level):
+    first = a2.load_model(level)
+    second = a2.WTModel(first.get_battlefield(), first.get_player(), first.get_enemies())
+    for _ in range(3):
+        first.enemy_actions()
+    assert second.state_hash() == first.state_hash() == _hash_from_scratch(first)
+
+
+def test_loaded_destroyed_rocks_cannot_be_repaired():
+    rubble = a2.make_tile(a2.DESTROYED_ID)
+    with pytest.raises(ValueError):
+        rubble.repair()
+    assert str(a2.make_tile(a2.DESTROYED_ID)) == a2.DESTROYED_ID
+    assert not a2.make_tile(a2.DESTROYED_ID).is_blocking()
+    battlefield = a2.CompactBattlefield(["WXR"])
+    with pytest.raises(ValueError):
+        battlefield.get_tile((0, 1)).repair()
+    assert str(battlefield) == "WXR"
+
+
+def test_controller_undo_and_rewind(monkeypatch, capsys):
+    controller = a2.WTController(a2.load_model(LEVELS[0]))
+    start = str(controller._model)
+    states = []
+    commands = ["fire", "turn left", "wait", "fire",
+                "undo", "rewind 2", "rewind 10", "undo", "quit"]
+
+    def command():
+        states.append(str(controller._model))
+        return commands.pop(0)
+
+    monkeypatch.setattr("builtins.input", command)
+    controller.play()
+    # The states seen after undo, rewind 2, rewind 10 and undo
+    assert states[5:] == [states[3], states[1], start, start]
+    assert capsys.readouterr().out.count(a2.NOTHING_TO_UNDO_MSG) == 1
@@ -0,0 +1,40 @@
+"""Shortest wins found by the breadth-first solver."""
+import headless
+import solver
+from conftest import LEVELS
+
+BOXED_IN = "WWWWWWW\nW WW  W\nWWWWWWW\n\nP,1,1,0,1,0,3\nG,1,4,0,1,0\n"
+
+
+def test_finds_shortest_win():
+    result = solver.solve(LEVELS[0])
+    assert result.is_solved()
+    assert len(result.commands) == 10
+    outcome = headless.run_game(LEVELS[0], result.commands)
+    assert (outcome.outcome, outcome.turns) == (headless.WON, 10)
+
+
+def test_workers_find_the_same_length(monkeypatch):
+    monkeypatch.setattr(solver, "PARALLEL_MIN", 1)
+    result = solver.solve(LEVELS[0], workers=2)
+    assert len(result.commands) == 10
+    assert headless.run_game(LEVELS[0], result.commands).outcome == headless.WON
+
+
+def test_beam_search_still_wins():
+    result = solver.solve(LEVELS[0], beam=20)
+    assert result.is_solved()
+    assert headless.run_game(LEVELS[0], result.commands).outcome == headless.WON
+
+
+def test_depth_bound():
+    result = solver.solve(LEVELS[0], max_depth=5)
+    assert not result.is_solved() and not result.exhausted
+
+
+def test_proves_unwinnable(tmp_path):
+    level = tmp_path / "boxed.txt"
+    level.write_text(BOXED_IN)
+    result = solver.solve(str(level))
+    assert not result.is_solved()
+    assert result.exhausted
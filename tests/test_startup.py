@@ -0,0 +1,67 @@
+"""Controllers build their view on first draw; cells share prebuilt displays."""
+import subprocess
+import sys
+
+import a2
+from conftest import LEVELS, ROOT
+from display import (TANK_MAP, TILE_MAP, MemorySink, WTView, get_cell_display,
+                     get_tank_display)
+from support import ENEMY_ID, GUARD_ID, PATROL_ID, PLAYER_ID, TANK_ID
+
+
+class CountingView(WTView):
+    built = 0
+
+    def __init__(self):
+        super().__init__()
+        CountingView.built += 1
+
+
+def _drawn(model: a2.WTModel):
+    return model.get_battlefield().get_tiles(), model.get_player(), model.get_enemies()
+
+
+def test_view_is_built_on_first_draw(monkeypatch):
+    monkeypatch.setattr(CountingView, "built", 0)
+    sink = MemorySink()
+    controller = a2.WTController(a2.load_model(LEVELS[0]), CountingView, sink=sink)
+    assert CountingView.built == 0
+    controller.start()
+    assert CountingView.built == 1
+    controller.play_script(["wait", "fire"])
+    assert CountingView.built == 1
+    assert controller.get_sink() is sink
+    eager = MemorySink()
+    view = WTView()
+    view.set_sink(eager)
+    view.draw_game(*_drawn(a2.load_model(LEVELS[0])))
+    assert sink.getvalue().startswith(eager.getvalue())
+
+
+def test_controller_without_sink_adopts_the_views(monkeypatch, capsys):
+    monkeypatch.setattr(CountingView, "built", 0)
+    controller = a2.WTController(a2.load_model(LEVELS[0]), CountingView)
+    assert controller.parse_command("wait") == "wait"
+    assert CountingView.built == 0
+    controller.play_script(["wait"])
+    assert CountingView.built == 1
+    assert a2.WELCOME_MSG in capsys.readouterr().out
+
+
+def test_cell_displays_match_fresh_ones():
+    for tile_id, display in TILE_MAP.items():
+        assert get_cell_display(tile_id) == display
+    for heading in TANK_MAP:
+        for tank_id in (PLAYER_ID, GUARD_ID, PATROL_ID, ENEMY_ID, TANK_ID, "?"):
+            assert get_cell_display((heading, tank_id)) == get_tank_display(heading, tank_id)
+    assert get_cell_display(None) == []
+
+
+def test_check_loads_without_playing():
+    ok = subprocess.run([sys.executable, "play.py", LEVELS[0], "--check"], cwd=ROOT,
+                        capture_output=True, text=True)
+    assert ok.returncode == 0 and ok.stdout.strip().endswith(": ok")
+    missing = subprocess.run([sys.executable, "play.py", "missing.txt", "--check"],
+                             cwd=ROOT, capture_output=True, text=True)
+    assert missing.returncode == 1
+    assert a2.FILE_NOT_FOUND_MSG in missing.stderr
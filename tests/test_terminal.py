@@ -0,0 +1,158 @@
+"""TerminalDiffWriter output, checked on a small terminal emulator."""
+import io
+import random
+import re
+
+import a2
+import display
+from conftest import LEVELS
+
+_ESCAPE = re.compile(r"\x1b\[(?:(\d+);(\d+))?([HJK])|\x1b\[2J|\x1b[78]")
+
+
+class Screen:
+    """Just enough of a terminal to replay the writer's escapes."""
+
+    def __init__(self):
+        self.rows: dict[int, str] = {}
+        self.row = self.col = 0
+        self.saved = (0, 0)
+
+    def feed(self, text: str):
+        index = 0
+        while index < len(text):
+            match = _ESCAPE.match(text, index)
+            if match:
+                index = match.end()
+                if match.group(0) == "\x1b[2J":
+                    self.rows = {}
+                elif match.group(0) == "\x1b7":
+                    self.saved = (self.row, self.col)
+                elif match.group(0) == "\x1b8":
+                    self.row, self.col = self.saved
+                elif match.group(3) == "H":
+                    self.row = int(match.group(1) or 1) - 1
+                    self.col = int(match.group(2) or 1) - 1
+                elif match.group(3) == "J":
+                    self.rows = {r: line for r, line in self.rows.items() if r < self.row}
+                    self.rows[self.row] = self.rows.get(self.row, "")[:self.col]
+                else:
+                    self.rows[self.row] = self.rows.get(self.row, "")[:self.col]
+                continue
+            char = text[index]
+            index += 1
+            if char == "\n":
+                self.row, self.col = self.row + 1, 0
+                continue
+            line = self.rows.get(self.row, "").ljust(self.col)
+            self.rows[self.row] = line[:self.col] + char + line[self.col + 1:]
+            self.col += 1
+
+    def lines(self, count: int) -> list[str]:
+        return [self.rows.get(row, "") for row in range(count)]
+
+    def below(self, count: int) -> list[str]:
+        """The lines under a frame of count rows, up to the last written."""
+        return [self.rows.get(row, "") for row in range(count, max(self.rows) + 1)]
+
+
+def _frames(level: str, seed: int, turns: int = 40):
+    """Rendered WTView frames of a game played at random."""
+    model = a2.load_model(level)
+    view = display.WTView()
+    rng = random.Random(seed)
+    for _ in range(turns):
+        if model.is_game_over():
+            break
+        view._battlefield.draw_tiles(model.get_battlefield().get_tiles())
+        view._battlefield.draw_entities(model.get_player(), model.get_enemies())
+        view._stats.draw_stats(model.get_player().get_armour(), len(model.get_enemies()))
+        yield view.render()
+        action = rng.choice(["fire", "forward", "left", "right"])
+        model.player_fire() if action == "fire" else model.player_move(action)
+        if not model.is_game_over():
+            model.enemy_actions()
+
+
+def test_updates_reproduce_each_frame():
+    writer = display.TerminalDiffWriter()
+    screen = Screen()
+    full = sent = 0
+    for level in LEVELS:
+        for lines in _frames(level, seed=2):
+            update = writer.update(lines)
+            screen.feed(update)
+            assert screen.lines(len(lines)) == lines
+            screen.feed(writer.clear_messages() + "prompt> typed\nmessage\n")
+            full += len("\n".join(lines)) + 1
+            sent += len(update)
+    assert sent < full / 2
+
+
+def test_rows_of_changing_length():
+    writer = display.TerminalDiffWriter()
+    screen = Screen()
+    rng = random.Random(1)
+    for _ in range(500):
+        lines = ["".join(rng.choice("ab ") for _ in range(rng.randint(0, 12)))
+                 for _ in range(4)]
+        screen.feed(writer.update(lines))
+        assert screen.lines(4) == lines
+
+
+def test_prints_like_wtview_off_terminal(capsys):
+    model = a2.load_model(LEVELS[0])
+    printed = []
+    for view in (display.WTView(), display.TerminalView()):
+        view.draw_game(model.get_battlefield().get_tiles(),
+                       model.get_player(), model.get_enemies())
+        printed.append(capsys.readouterr().out)
+    assert printed[1] == printed[0]
+
+
+def test_messages_around_a_frame_are_kept():
+    writer = display.TerminalDiffWriter()
+    screen = Screen()
+    frames = list(_frames(LEVELS[0], seed=3, turns=6))
+    screen.feed(writer.update(frames[0]) + "Welcome!\nprompt> fire\n")
+    assert screen.below(len(frames[0])) == ["Welcome!", "prompt> fire"]
+    for turn, lines in enumerate(frames[1:]):
+        # One turn's output: a clear, a message, the frame, another message
+        screen.feed(writer.clear_messages() + f"before {turn}\n"
+                    + writer.update(lines) + f"after {turn}\nprompt> ")
+        assert screen.lines(len(lines)) == lines
+        assert screen.below(len(lines)) == [f"before {turn}", f"after {turn}", "prompt> "]
+
+
+def test_terminal_view_clears_once_per_turn(monkeypatch):
+    stream = io.StringIO()
+    sink = display.OutputSink(stream)
+    view = display.TerminalView()
+    view.set_sink(sink)
+    monkeypatch.setattr(view, "_fits_terminal", lambda height: True)
+    model = a2.load_model(LEVELS[0])
+    screen = Screen()
+
+    def turn(before: str, after: str):
+        sink.write(before)
+        view.draw_game(model.get_battlefield().get_tiles(),
+                       model.get_player(), model.get_enemies())
+        sink.write(after)
+        sink.flush()
+        screen.feed(stream.getvalue())
+        stream.seek(0)
+        stream.truncate()
+
+    turn("Game loaded!\n", "prompt> ")
+    height = len(view.render())
+    assert screen.below(height) == ["Game loaded!", "prompt> "]
+    model.player_move("left")
+    turn("", "prompt> ")
+    assert screen.below(height) == ["prompt> "]
+    model.player_fire()
+    turn("Game saved!\n", "Welcome!\nprompt> ")
+    assert screen.below(height) == ["Game saved!", "Welcome!", "prompt> "]
+    assert screen.lines(height) == view.render()
+    sink.write("Game saved!\n")
+    sink.flush()
+    assert stream.getvalue().count(display.TerminalDiffWriter.CLEAR_BELOW) == 1
@@ -0,0 +1,54 @@
+"""VectorWTModel must play exactly like WTModel."""
+import random
+
+import pytest
+
+pytest.importorskip("numpy")
+
+import a2  # noqa: E402
+from vector_model import VectorWTModel  # noqa: E402
+
+ACTIONS = ("forward", "back", "left", "right", "fire", "fire")
+
+
+def _act(model, action: str):
+    if action == "fire":
+        model.player_fire()
+    else:
+        model.player_move(action)
+
+
+def _play_both(level: str, seed: int, turns: int = 60):
+    rng = random.Random(seed)
+    model = a2.load_model(level)
+    vector = VectorWTModel(a2.load_model(level))
+    assert str(vector) == str(model)
+    for turn in range(turns):
+        if model.is_game_over():
+            break
+        action = rng.choice(ACTIONS)
+        _act(model, action)
+        _act(vector, action)
+        assert str(vector) == str(model), (turn, action)
+        if not model.is_game_over():
+            model.enemy_actions()
+            vector.enemy_actions()
+        assert str(vector) == str(model), (turn, "enemies")
+    assert vector.is_game_over() == model.is_game_over()
+    assert str(vector.to_model()) == str(model)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_matches_wtmodel(level, seed):
+    _play_both(level, seed)
+
+
+def test_matches_wtmodel_on_large_level(large_level):
+    _play_both(large_level, seed=0, turns=20)
+
+
+def test_rejects_ragged_battlefield(tmp_path):
+    path = tmp_path / "ragged.txt"
+    path.write_text("WWWW\nW  W\nW W\nWWWW\n\nP,1,1,0,1,0,2\n")
+    with pytest.raises(ValueError):
+        VectorWTModel(a2.load_model(str(path)))
@@ -0,0 +1,356 @@
+"""
+Vectorised batch simulation core for We Tank!
+
+VectorWTModel follows the same rules as WTModel, but enemy positions, headings
+and speeds are held in NumPy arrays and the battlefield is a boolean blocking
+grid. The enemy phase is computed with array operations. Requires NumPy.
+"""
+import numpy as np
+
+from a2 import Battlefield, Guard, Patrol, Player, WTModel, make_tile
+from support import *
+
+# Headings in the order used to index the sight tables
+HEADINGS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+_FAR = np.iinfo(np.int64).max
+
+
+def _heading_index(heading: np.ndarray) -> np.ndarray:
+    """Return the HEADINGS index of each row of an (N, 2) array of unit headings."""
+    dx, dy = heading[:, 0], heading[:, 1]
+    return np.where(dx != 0, (dx + 1) // 2, 2 + (dy + 1) // 2)
+
+
+def _reach_right(blocking: np.ndarray) -> np.ndarray:
+    """
+    For each cell of a 2D blocking grid, count the cells visible looking right:
+    up to and including the first blocking cell, or up to the edge.
+    """
+    cols = blocking.shape[1]
+    col = np.arange(cols)
+    # Smallest blocking column >= y, or cols if there is none
+    nearest = np.minimum.accumulate(
+        np.where(blocking, col, cols)[:, ::-1], axis=1
+    )[:, ::-1]
+    following = np.full_like(nearest, cols)
+    following[:, :-1] = nearest[:, 1:]
+    return np.where(following < cols, following - col, cols - 1 - col)
+
+
+def _expand(starts: np.ndarray, directions: np.ndarray, lengths: np.ndarray):
+    """
+    Expand N rays into their cells.
+
+    Returns:
+        (owner, step, cells): for every cell, the index of the ray it belongs
+        to, its distance (1-based) from the ray's start, and its (row, col).
+    """
+    owner = np.repeat(np.arange(len(lengths)), lengths)
+    offsets = np.cumsum(lengths) - lengths
+    step = np.arange(len(owner)) - offsets[owner] + 1
+    cells = starts[owner] + step[:, None] * directions[owner]
+    return owner, step, cells
+
+
+class VectorWTModel:
+    """
+    WTModel equivalent whose enemy phase runs as NumPy array operations.
+
+    Enemies still act in list order: each enemy sees the moves made by the
+    enemies before it, and the player is hit at most once per turn. Actions
+    are computed for a window of enemies at once against the current state.
+    The longest prefix of the window whose rays and paths avoid every cell
+    vacated or entered earlier in that prefix is committed. The next window
+    starts at the first enemy that conflicted, so results match WTModel
+    exactly. Only the four unit headings are supported.
+    """
+
+    MIN_WINDOW = 32
+
+    def __init__(self, model: WTModel):
+        """
+        Build a batch model from the current state of an object model.
+
+        Raises:
+            ValueError: if the battlefield is not rectangular, or a tank is
+                    outside it or has a heading other than the four unit headings.
+        """
+        rows = str(model.get_battlefield()).split("\n")
+        if any(len(row) != len(rows[0]) for row in rows):
+            raise ValueError("VectorWTModel requires a rectangular battlefield")
+        self._codes = np.frombuffer(
+            "".join(rows).encode("ascii"), dtype=np.uint8
+        ).reshape(len(rows), len(rows[0])).copy()
+        self._blocking = (self._codes == ord(WALL_ID)) | (self._codes == ord(ROCK_ID))
+        self._build_sight()
+
+        player = model.get_player()
+        self._player_pos = player.get_position()
+        self._player_heading = player.get_heading()
+        self._player_speed = player.get_speed()
+        self._player_armour = player.get_armour()
+
+        enemies = model.get_enemies()
+        self._pos = np.array([e.get_position() for e in enemies], dtype=np.int64).reshape(-1, 2)
+        self._head = np.array([e.get_heading() for e in enemies], dtype=np.int64).reshape(-1, 2)
+        self._speed = np.array([e.get_speed() for e in enemies], dtype=np.int64)
+        self._patrol = np.array([isinstance(e, Patrol) for e in enemies], dtype=bool)
+        self._ids = [e.get_id() for e in enemies]
+
+        positions = np.vstack([np.array([self._player_pos]), self._pos])
+        headings = np.vstack([np.array([self._player_heading]), self._head])
+        if not (np.abs(headings).sum(axis=1) == 1).all():
+            raise ValueError("VectorWTModel only supports unit headings")
+        if not self._in_bounds(positions).all():
+            raise ValueError("VectorWTModel requires every tank on the battlefield")
+
+        self._occupancy = np.zeros(self._codes.shape, dtype=np.int64)
+        np.add.at(self._occupancy, (positions[:, 0], positions[:, 1]), 1)
+
+    def __str__(self) -> str:
+        rows, cols = self._codes.shape
+        data = self._codes.tobytes().decode("ascii")
+        battlefield_str = "\n".join(data[r * cols:(r + 1) * cols] for r in range(rows))
+        (row, col), (h_row, h_col) = self._player_pos, self._player_heading
+        player_str = (f"{PLAYER_ID},{row},{col},{h_row},{h_col},"
+                      f"{self._player_speed},{self._player_armour}")
+        enemies_str = "\n".join(
+            f"{eid},{row},{col},{h_row},{h_col},{speed}"
+            for eid, (row, col), (h_row, h_col), speed
+            in zip(self._ids, self._pos.tolist(), self._head.tolist(), self._speed.tolist())
+        )
+        return f"{battlefield_str}\n\n{player_str}\n{enemies_str}" if enemies_str else f"{battlefield_str}\n\n{player_str}"
+
+    def to_model(self) -> WTModel:
+        """Return an object WTModel holding the same state."""
+        tiles = [[make_tile(ch) for ch in row] for row in str(self).split("\n\n")[0].split("\n")]
+        player = Player(self._player_pos, self._player_heading,
+                        self._player_speed, self._player_armour)
+        enemies = [
+            (Patrol if patrol else Guard)(tuple(pos), tuple(head), speed)
+            for pos, head, speed, patrol in zip(
+                self._pos.tolist(), self._head.tolist(),
+                self._speed.tolist(), self._patrol.tolist())
+        ]
+        return WTModel(Battlefield(tiles), player, enemies)
+
+    # --- Queries ---
+    def get_enemy_count(self) -> int:
+        return len(self._ids)
+
+    def get_player_armour(self) -> int:
+        return self._player_armour
+
+    def has_won(self) -> bool:
+        return self.get_enemy_count() == 0 and self._player_armour > 0
+
+    def has_lost(self) -> bool:
+        return self._player_armour <= 0
+
+    def is_game_over(self) -> bool:
+        return self.has_won() or self.has_lost()
+
+    # --- Battlefield helpers ---
+    def _in_bounds(self, cells: np.ndarray) -> np.ndarray:
+        rows, cols = self._codes.shape
+        return ((cells[:, 0] >= 0) & (cells[:, 0] < rows)
+                & (cells[:, 1] >= 0) & (cells[:, 1] < cols))
+
+    def _build_sight(self):
+        blocking = self._blocking
+        self._sight = np.empty((4,) + blocking.shape, dtype=np.int64)
+        self._sight[0] = _reach_right(blocking[::-1].T).T[::-1]  # up
+        self._sight[1] = _reach_right(blocking.T).T               # down
+        self._sight[2] = _reach_right(blocking[:, ::-1])[:, ::-1] # left
+        self._sight[3] = _reach_right(blocking)                   # right
+
+    def _update_sight(self, row: int, col: int):
+        """Recompute the sight tables along the row and column through a changed cell."""
+        blocking = self._blocking
+        line = blocking[row:row + 1]
+        self._sight[3, row] = _reach_right(line)[0]
+        self._sight[2, row] = _reach_right(line[:, ::-1])[0, ::-1]
+        column = blocking[:, col][None, :]
+        self._sight[1, :, col] = _reach_right(column)[0]
+        self._sight[0, :, col] = _reach_right(column[:, ::-1])[0, ::-1]
+
+    # --- Player turn ---
+    def _player_advance(self):
+        speed = self._player_speed
+        if speed == 0:
+            return
+        dx, dy = self._player_heading
+        steps = speed
+        if speed < 0:
+            dx, dy = -dx, -dy
+            steps = -speed
+
+        rows, cols = self._codes.shape
+        x, y = self._player_pos
+        for _ in range(steps):
+            nx, ny = x + dx, y + dy
+            if not (0 <= nx < rows and 0 <= ny < cols):
+                break
+            if self._blocking[nx, ny] or self._occupancy[nx, ny]:
+                break
+            x, y = nx, ny
+
+        self._occupancy[self._player_pos] -= 1
+        self._occupancy[x, y] += 1
+        self._player_pos = (x, y)
+        self._player_speed = 0
+
+    def player_move(self, move: str):
+        row, col = self._player_heading
+        if move == "left":
+            self._player_heading = (-col, row)
+        elif move == "right":
+            self._player_heading = (col, -row)
+        elif move == "forward":
+            self._player_speed = 1
+            self._player_advance()
+        elif move == "back":
+            self._player_speed = 1
+            self._player_heading = (-row, -col)
+            self._player_advance()
+            self._player_heading = (row, col)
+        self._player_speed = 0
+
+    def player_fire(self):
+        x, y = self._player_pos
+        dx, dy = self._player_heading
+        distance = int(self._sight[HEADINGS.index((dx, dy)), x, y])
+        target = None
+        for step in range(1, distance + 1):
+            cell = (x + dx * step, y + dy * step)
+            if self._occupancy[cell] or self._blocking[cell]:
+                target = cell
+                break
+        if target is None:
+            return
+
+        if self._occupancy[target]:
+            index = int(np.flatnonzero((self._pos == target).all(axis=1))[0])
+            self._occupancy[target] -= 1
+            self._pos = np.delete(self._pos, index, axis=0)
+            self._head = np.delete(self._head, index, axis=0)
+            self._speed = np.delete(self._speed, index)
+            self._patrol = np.delete(self._patrol, index)
+            del self._ids[index]
+        elif self._codes[target] == ord(ROCK_ID):
+            self._codes[target] = ord(DESTROYED_ID)
+            self._blocking[target] = False
+            self._update_sight(*target)
+
+    # --- Enemy phase ---
+    def enemy_actions(self):
+        player_hit = False
+        start = 0
+        window = self.MIN_WINDOW
+        while start < len(self._ids):
+            end = min(len(self._ids), start + window)
+            committed, player_hit = self._resolve(start, end, player_hit)
+            # Grow the window while whole windows commit, shrink it on conflicts
+            if committed == end - start:
+                window *= 2
+            else:
+                window = max(self.MIN_WINDOW, committed * 2)
+            start += committed
+
+    def _resolve(self, start: int, end: int, player_hit: bool) -> tuple[int, bool]:
+        """
+        Compute the actions of enemies[start:end] against the current state and
+        commit the longest prefix whose results are unaffected by earlier moves
+        within it.
+
+        Returns:
+            (committed, player_hit): how many enemies were committed, and
+            whether the player has now been hit this turn.
+        """
+        blocking, occupancy = self._blocking, self._occupancy
+        pos = self._pos[start:end]
+        head = self._head[start:end]
+        speed = self._speed[start:end].copy()
+        patrol = self._patrol[start:end]
+        count = end - start
+
+        # Line of sight and attack targets
+        visible = self._sight[_heading_index(head), pos[:, 0], pos[:, 1]]
+        owner, step, cells = _expand(pos, head, visible)
+        first_tank = np.full(count, _FAR)
+        occupied = occupancy[cells[:, 0], cells[:, 1]] > 0
+        np.minimum.at(first_tank, owner[occupied], step[occupied])
+        last = pos + visible[:, None] * head
+        ends_on_block = (visible > 0) & blocking[last[:, 0], last[:, 1]]
+        target = np.where(first_tank < _FAR, first_tank,
+                          np.where(ends_on_block, visible, _FAR))
+        reached = pos + np.where(target < _FAR, target, 0)[:, None] * head
+        targets_player = (target < _FAR) & (reached == self._player_pos).all(axis=1)
+        hit = targets_player & (np.cumsum(targets_player) == 1) & (not player_hit)
+
+        # Enemy decisions
+        new_head = head.copy()
+        guard_turn = ~hit & ~patrol
+        new_head[guard_turn] = np.stack(
+            [-head[guard_turn, 1], head[guard_turn, 0]], axis=1)
+        patrol_go = ~hit & patrol & (visible >= 2)
+        speed[patrol_go] = Patrol.DESIRED_SPEED
+        patrol_back = ~hit & patrol & (visible < 2)
+        new_head[patrol_back] = -head[patrol_back]
+
+        # Movement along heading (or backwards for negative speed)
+        direction = new_head * np.sign(speed)[:, None]
+        steps = np.abs(speed)
+        path_owner, path_step, path = _expand(pos, direction, steps)
+        inside = self._in_bounds(path)
+        stopped = ~inside
+        inner = path[inside]
+        stopped[inside] = blocking[inner[:, 0], inner[:, 1]] | \
+                (occupancy[inner[:, 0], inner[:, 1]] > 0)
+        first_stop = np.full(count, _FAR)
+        np.minimum.at(first_stop, path_owner[stopped], path_step[stopped])
+        moved = np.minimum(steps, first_stop - 1)
+        new_pos = pos + moved[:, None] * direction
+
+        # Find the first enemy whose ray or path crosses a cell vacated or
+        # entered by an earlier mover in this window
+        cols = self._codes.shape[1]
+        movers = np.flatnonzero(moved > 0)
+        committed = count
+        if len(movers):
+            changed_keys = np.concatenate([
+                pos[movers, 0] * cols + pos[movers, 1],
+                new_pos[movers, 0] * cols + new_pos[movers, 1],
+            ])
+            changed_by = np.concatenate([movers, movers])
+            order = np.lexsort((changed_by, changed_keys))
+            keys, first = np.unique(changed_keys[order], return_index=True)
+            earliest = changed_by[order][first]
+
+            seen_owner = np.concatenate([owner, path_owner[inside]])
+            seen = np.concatenate([cells, inner])
+            seen_keys = seen[:, 0] * cols + seen[:, 1]
+            slot = np.minimum(np.searchsorted(keys, seen_keys), len(keys) - 1)
+            conflict = (keys[slot] == seen_keys) & (earliest[slot] < seen_owner)
+            if conflict.any():
+                committed = int(seen_owner[conflict].min())
+
+        # Commit enemies[start:start + committed]
+        done = slice(0, committed)
+        moving = movers[movers < committed]
+        np.subtract.at(occupancy, (pos[moving, 0], pos[moving, 1]), 1)
+        np.add.at(occupancy, (new_pos[moving, 0], new_pos[moving, 1]), 1)
+        self._pos[start:start + committed] = new_pos[done]
+        self._head[start:start + committed] = new_head[done]
+        self._speed[start:start + committed] = 0
+
+        hitters = np.flatnonzero(hit[done])
+        if len(hitters):
+            self._player_armour = max(0, self._player_armour - 1)
+            if patrol[hitters[0]]:
+                row, col = self._player_heading
+                self._player_heading = (-row, -col)
+            else:
+                self._player_speed = -2
+            player_hit = True
+        return committed, player_hit